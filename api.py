@@ -0,0 +1,313 @@
+# api.py
+#
+# API JSON de solo lectura sobre las tablas combinadas, para que otros servicios no
+# tengan que raspar las páginas de Streamlit. Es una app ASGI sin dependencias extra:
+#   uvicorn api:app --port 8000
+#
+# GET /carreras/<universitaria|tecnica|combinado>
+#     ?carrera=ingenieria        nombre (sin tildes ni mayúsculas) que contenga el texto
+#     &tipo=tecnica              solo en combinado
+#     &region=Arequipa           con libros regionales (CARRERAS_REGIONES)
+#     &ingreso_min=3000&ingreso_max=&puestos_min=&puestos_max=
+#     &orden=-Ingreso_promedio   columna de orden; "-" para descendente
+#     &limite=10&desde=0         top-N y paginación
+#     &campos=Carrera,Ingreso_promedio
+# GET /dimension, /cobertura, /salud, /metrics
+#
+# Las respuestas llevan ETag (versión de los datos + consulta): con If-None-Match se
+# responde 304 sin volver a calcular nada. Se comprimen con gzip si el cliente lo acepta.
+
+import asyncio
+import gzip
+import hashlib
+import json
+import math
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qs
+
+import numpy as np
+
+from modules import almacen, metricas
+from modules.fuentes import REGION_NACIONAL, TIPOS, refrescar_tablas
+from modules.dimension_carreras import claves
+from modules.limpieza import normalizar_carrera
+
+# Subir este número cuando cambie el formato de las respuestas (invalida los ETag)
+VERSION_API = 1
+
+# Respuestas ya serializadas que se conservan en memoria
+MAX_RESPUESTAS = 512
+
+# Las respuestas más chicas no se comprimen
+MIN_GZIP = 1024
+
+COLUMNAS_ORDEN = ['Carrera', 'Ingreso_promedio', 'Ingreso_Minimo', 'Ingreso_Maximo', 'Puestos_solicitados_2024']
+
+# Parámetro de filtro -> columna (se aceptan <nombre>_min y <nombre>_max)
+FILTROS = {"ingreso": 'Ingreso_promedio', "puestos": 'Puestos_solicitados_2024'}
+
+PARAMETROS = {"carrera", "tipo", "region", "orden", "limite", "desde", "campos",
+              *(f"{nombre}_{limite}" for nombre in FILTROS for limite in ("min", "max"))}
+
+
+class ErrorConsulta(ValueError):
+    """
+    Parámetros inválidos en una consulta; se responde con 400.
+    """
+
+
+class IndiceTabla:
+    """
+    Una tabla combinada con sus órdenes precalculados: para cada columna, las
+    posiciones de las filas en orden ascendente y descendente (sin dato al final).
+    Ordenar y cortar el top-N es indexar estos arreglos con la máscara del filtro.
+    """
+
+    def __init__(self, df):
+        self.df = df.reset_index(drop=True)
+        self.claves = claves(self.df['Carrera']).to_numpy(dtype=str)
+        self.tipos = self.df['Tipo'].to_numpy() if 'Tipo' in self.df else None
+        self.valores = {
+            columna: self.df[columna].astype('Float64').to_numpy(dtype=float, na_value=np.nan)
+            for columna in COLUMNAS_ORDEN[1:]
+        }
+        ascendente = np.argsort(self.claves, kind="stable")
+        self.orden = {('Carrera', False): ascendente, ('Carrera', True): ascendente[::-1]}
+        for columna, valores in self.valores.items():
+            # argsort deja los NaN al final en ambos sentidos
+            self.orden[(columna, False)] = np.argsort(valores, kind="stable")
+            self.orden[(columna, True)] = np.argsort(-valores, kind="stable")
+
+    def consultar(self, parametros):
+        """
+        Aplica filtros, orden, corte y selección de campos. Devuelve (total, DataFrame).
+        """
+        mascara = np.ones(len(self.df), dtype=bool)
+        if "carrera" in parametros:
+            mascara &= np.char.find(self.claves, normalizar_carrera(parametros["carrera"])) >= 0
+        if "tipo" in parametros:
+            if self.tipos is None:
+                raise ErrorConsulta("'tipo' solo se puede usar en /carreras/combinado")
+            mascara &= self.tipos == parametros["tipo"]
+        for nombre, columna in FILTROS.items():
+            for limite, comparar in (("min", np.greater_equal), ("max", np.less_equal)):
+                if f"{nombre}_{limite}" in parametros:
+                    mascara &= comparar(self.valores[columna], _numero(parametros, f"{nombre}_{limite}"))
+
+        orden = parametros.get("orden")
+        if orden:
+            columna = orden.lstrip("-")
+            if columna not in COLUMNAS_ORDEN:
+                raise ErrorConsulta(f"No se puede ordenar por '{columna}'; columnas: {', '.join(COLUMNAS_ORDEN)}")
+            posiciones = self.orden[(columna, orden.startswith("-"))]
+            posiciones = posiciones[mascara[posiciones]]
+        else:
+            posiciones = np.flatnonzero(mascara)
+
+        desde = _numero(parametros, "desde", 0)
+        limite = parametros.get("limite")
+        fin = desde + _numero(parametros, "limite") if limite else None
+        resultado = self.df.iloc[posiciones[desde:fin]]
+        if "campos" in parametros:
+            campos = [c for c in parametros["campos"].split(",") if c]
+            faltantes = [c for c in campos if c not in resultado.columns]
+            if faltantes:
+                raise ErrorConsulta(f"Campos desconocidos: {', '.join(faltantes)}")
+            resultado = resultado[campos]
+        return len(posiciones), resultado
+
+
+def _numero(parametros, nombre, defecto=None):
+    # 'desde' y 'limite' son posiciones: enteros no negativos. Los filtros aceptan cualquier
+    # número finito ("nan" o "1e400" no se pueden comparar y se rechazan con 400)
+    posicion = nombre in ("limite", "desde")
+    try:
+        valor = int(parametros.get(nombre, defecto)) if posicion else float(parametros.get(nombre, defecto))
+    except (TypeError, ValueError):
+        raise ErrorConsulta(f"'{nombre}' debe ser un {'entero' if posicion else 'número'}") from None
+    if not posicion and not math.isfinite(valor):
+        raise ErrorConsulta(f"'{nombre}' debe ser un número finito")
+    if posicion and valor < 0:
+        raise ErrorConsulta(f"'{nombre}' no puede ser negativo")
+    return valor
+
+
+_lock = threading.Lock()
+_lock_indices = threading.Lock()
+# responder corre en el pool de asyncio.to_thread: el LRU de respuestas se comparte entre hilos
+_lock_respuestas = threading.Lock()
+_estado = {"manifiesto": None, "revisado": 0.0}
+_indices = {}
+_respuestas = OrderedDict()
+
+
+def _revision_pendiente():
+    return time.monotonic() - _estado["revisado"] > almacen.INTERVALO_REVISION
+
+
+def revisar():
+    """
+    Relee el manifiesto del almacén (refrescando las tablas si vencieron) y, si
+    cambió, descarta los índices y las respuestas de la versión anterior.
+    """
+    with _lock:
+        if not _revision_pendiente():
+            return
+        manifiesto = almacen.asegurar(refrescar_tablas)
+        anterior = _estado["manifiesto"]
+        if anterior is None or anterior["tablas"] != manifiesto["tablas"]:
+            _indices.clear()
+            with _lock_respuestas:
+                _respuestas.clear()
+        _estado.update(manifiesto=manifiesto, revisado=time.monotonic())
+
+
+def _entrada(tabla, region):
+    tablas = _estado["manifiesto"]["tablas"]
+    if region in (None, REGION_NACIONAL):
+        return tablas[tabla]
+    if tabla not in TIPOS or f"regional_{tabla}" not in tablas:
+        raise ErrorConsulta("No hay datos regionales para esta tabla")
+    return tablas[f"regional_{tabla}"]
+
+
+def indice(tabla, region=None):
+    """
+    IndiceTabla de una tabla publicada (o de una región), armado una vez por versión.
+    """
+    entrada = _entrada(tabla, region)
+    clave = (entrada["archivo"], region)
+    resultado = _indices.get(clave)
+    if resultado is None:
+        with _lock_indices, metricas.tramo("api_indice"):
+            df = almacen.leer(entrada)
+            if region not in (None, REGION_NACIONAL):
+                df = df[df['Region'] == region].drop(columns='Region')
+                if df.empty:
+                    raise ErrorConsulta(f"Región desconocida: {region}")
+            resultado = _indices[clave] = IndiceTabla(df)
+    return resultado
+
+
+def _etag(version, ruta, parametros):
+    consulta = json.dumps([VERSION_API, ruta, sorted(parametros.items())], ensure_ascii=False)
+    return f'"{version}-{hashlib.sha256(consulta.encode("utf-8")).hexdigest()[:16]}"'
+
+
+def _cuerpo(ruta, parametros):
+    # Devuelve (versión de los datos, función que arma el cuerpo JSON)
+    tablas = _estado["manifiesto"]["tablas"]
+    if ruta in ("/dimension", "/cobertura"):
+        entrada = tablas[ruta[1:]]
+        return entrada["version"], lambda: almacen.leer(entrada).to_json(orient="records", force_ascii=False)
+    tabla = ruta[len("/carreras/"):]
+    if not ruta.startswith("/carreras/") or tabla not in (*TIPOS, "combinado"):
+        return None, None
+    desconocidos = set(parametros) - PARAMETROS
+    if desconocidos:
+        raise ErrorConsulta(f"Parámetros desconocidos: {', '.join(sorted(desconocidos))}")
+    region = parametros.get("region")
+    entrada = _entrada(tabla, region)
+
+    def armar():
+        total, df = indice(tabla, region).consultar(parametros)
+        return f'{{"version": "{entrada["version"]}", "total": {total}, ' \
+               f'"carreras": {df.to_json(orient="records", force_ascii=False)}}}'
+    return entrada["version"], armar
+
+
+def responder(metodo, ruta, parametros, encabezados):
+    """
+    Atiende una petición ya decodificada. Devuelve (estado, encabezados, cuerpo en bytes).
+    """
+    if metodo not in ("GET", "HEAD"):
+        return 405, [(b"allow", b"GET, HEAD")], b""
+    if ruta == "/metrics":
+        return 200, [(b"content-type", b"text/plain; version=0.0.4")], metricas.exportar_prometheus().encode()
+    if ruta == "/salud":
+        manifiesto = _estado["manifiesto"]
+        cuerpo = json.dumps({"listo": manifiesto is not None, "actualizado": manifiesto and manifiesto["actualizado"]})
+        return 200, [(b"content-type", b"application/json")], cuerpo.encode()
+
+    try:
+        version, armar = _cuerpo(ruta, parametros)
+        if version is None:
+            return 404, [(b"content-type", b"application/json")], b'{"error": "ruta desconocida"}'
+        etag = _etag(version, ruta, parametros)
+        comunes = [
+            (b"etag", etag.encode()),
+            (b"cache-control", f"public, max-age={almacen.INTERVALO_REVISION}".encode()),
+            (b"vary", b"accept-encoding"),
+        ]
+        if etag in [e.strip() for e in encabezados.get(b"if-none-match", b"").decode().split(",")]:
+            metricas.contar_cache("api", True)
+            return 304, comunes, b""
+
+        with _lock_respuestas:
+            respuesta = _respuestas.get(etag)
+            if respuesta is not None:
+                # Al final del OrderedDict quedan las usadas más recientemente
+                _respuestas.move_to_end(etag)
+        metricas.contar_cache("api", respuesta is not None)
+        if respuesta is None:
+            cuerpo = armar().encode("utf-8")
+            respuesta = [cuerpo, gzip.compress(cuerpo, 5) if len(cuerpo) >= MIN_GZIP else None]
+            with _lock_respuestas:
+                _respuestas[etag] = respuesta
+                while len(_respuestas) > MAX_RESPUESTAS:
+                    _respuestas.popitem(last=False)
+    except ErrorConsulta as e:
+        return 400, [(b"content-type", b"application/json")], json.dumps({"error": str(e)}, ensure_ascii=False).encode()
+
+    cuerpo, comprimido = respuesta
+    encabezados_respuesta = [(b"content-type", b"application/json; charset=utf-8"), *comunes]
+    if comprimido is not None and b"gzip" in encabezados.get(b"accept-encoding", b""):
+        cuerpo = comprimido
+        encabezados_respuesta.append((b"content-encoding", b"gzip"))
+    return 200, encabezados_respuesta, cuerpo
+
+
+def _atender(metodo, ruta, parametros, encabezados):
+    with metricas.tramo("api"):
+        return responder(metodo, ruta, parametros, encabezados)
+
+
+async def app(scope, receive, send):
+    """
+    Aplicación ASGI (HTTP y lifespan).
+    """
+    if scope["type"] == "lifespan":
+        while True:
+            mensaje = await receive()
+            if mensaje["type"] == "lifespan.startup":
+                # Carga las tablas antes de aceptar peticiones
+                try:
+                    await asyncio.to_thread(revisar)
+                except Exception as e:
+                    await send({"type": "lifespan.startup.failed", "message": str(e)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif mensaje["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+    if scope["type"] != "http":
+        return
+
+    # La revisión del manifiesto puede descargar datos: se hace fuera del event loop
+    if _revision_pendiente():
+        await asyncio.to_thread(revisar)
+    parametros = {k: v[-1] for k, v in parse_qs(scope["query_string"].decode("utf-8")).items()}
+    encabezados = dict(scope["headers"])
+    # Armar un índice o un cuerpo nuevo (filtrar, serializar, comprimir) bloquearía el
+    # event loop durante decenas de milisegundos: responder corre en un hilo
+    estado, encabezados_respuesta, cuerpo = await asyncio.to_thread(
+        _atender, scope["method"], scope["path"], parametros, encabezados
+    )
+    metricas.contar("api", estado=estado)
+
+    if estado != 304:
+        encabezados_respuesta.append((b"content-length", str(len(cuerpo)).encode()))
+    await send({"type": "http.response.start", "status": estado, "headers": encabezados_respuesta})
+    await send({"type": "http.response.body", "body": b"" if scope["method"] == "HEAD" else cuerpo})
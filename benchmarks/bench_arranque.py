@@ -0,0 +1,61 @@
+# benchmarks/bench_arranque.py
+#
+# Desglose del tiempo de importación al arrancar la app y al abrir cada página.
+# Uso: python -m benchmarks.bench_arranque [--top 15]
+
+import argparse
+import os
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Lo que se importa antes de la primera pintura y lo que agrega cada página al abrirse
+ESCENARIOS = {
+    "arranque (sidebar)": "import modules.config_page, modules.create_sidebar",
+    "Universitaria": "import modules.create_sidebar, paginas.universitaria",
+    "Técnica": "import modules.create_sidebar, paginas.tecnica",
+    "Preguntas": "import modules.create_sidebar, paginas.preguntas",
+}
+
+# Dependencias pesadas que no deberían cargarse en el arranque
+PESADAS = ("pandas", "plotly", "statsmodels", "requests", "pyarrow", "numpy")
+
+
+def medir_importacion(codigo):
+    """
+    Ejecuta `codigo` en un intérprete nuevo con -X importtime y devuelve
+    {módulo: (propio_us, acumulado_us)} de los módulos importados.
+    """
+    proceso = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo],
+        cwd=RAIZ, capture_output=True, text=True, check=True,
+    )
+    tiempos = {}
+    for linea in proceso.stderr.splitlines():
+        if not linea.startswith("import time:") or "self [us]" in linea:
+            continue
+        propio, acumulado, modulo = linea[len("import time:"):].split("|")
+        tiempos[modulo.strip()] = (int(propio), int(acumulado))
+    return tiempos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Desglose del tiempo de importación.")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    for escenario, codigo in ESCENARIOS.items():
+        tiempos = medir_importacion(codigo)
+        total = sum(propio for propio, _ in tiempos.values())
+        pesadas = sorted({m.split(".")[0] for m in tiempos} & set(PESADAS))
+        print(f"\n== {escenario}: {total / 1000:.0f} ms, {len(tiempos)} módulos")
+        print(f"   dependencias pesadas: {', '.join(pesadas) or 'ninguna'}")
+        # Paquetes de primer nivel ordenados por tiempo acumulado
+        raices = {m: t for m, t in tiempos.items() if "." not in m}
+        for modulo, (_, acumulado) in sorted(raices.items(), key=lambda x: -x[1][1])[:args.top]:
+            print(f"   {acumulado / 1000:>8.1f} ms  {modulo}")
+
+
+if __name__ == "__main__":
+    main()
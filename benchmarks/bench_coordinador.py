@@ -0,0 +1,78 @@
+# benchmarks/bench_coordinador.py
+#
+# Simula una ráfaga de sesiones que preguntan a la vez contra el servidor LLM falso
+# (con latencia artificial) y compara llamadas directas con el coordinador.
+# Uso: python -m benchmarks.bench_coordinador [--sesiones 40] [--distintas 5] [--latencia 0.5]
+
+import argparse
+import threading
+import time
+
+from benchmarks.servidor_llm_falso import iniciar
+from modules import cliente_llm
+from modules.coordinador_llm import CoordinadorLLM, ServicioSaturado
+
+
+def rafaga(sesiones, distintas, consultar):
+    # Todas las sesiones arrancan juntas, como al pulsar la misma sugerencia en clase
+    resultados = {"ok": 0, "rechazadas": 0, "errores": 0}
+    lock = threading.Lock()
+    barrera = threading.Barrier(sesiones)
+
+    def sesion(i):
+        barrera.wait()
+        try:
+            consultar(f"Pregunta {i % distintas}")
+            clave = "ok"
+        except ServicioSaturado:
+            clave = "rechazadas"
+        except Exception:
+            clave = "errores"
+        with lock:
+            resultados[clave] += 1
+
+    hilos = [threading.Thread(target=sesion, args=(i,)) for i in range(sesiones)]
+    inicio = time.perf_counter()
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    resultados["segundos"] = round(time.perf_counter() - inicio, 2)
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ráfaga de preguntas con y sin coordinador.")
+    parser.add_argument("--sesiones", type=int, default=40)
+    parser.add_argument("--distintas", type=int, default=5)
+    parser.add_argument("--latencia", type=float, default=0.5)
+    parser.add_argument("--concurrencia", type=int, default=4)
+    parser.add_argument("--cola", type=int, default=16)
+    args = parser.parse_args()
+
+    for nombre in ("directo", "coordinador"):
+        servidor = iniciar(latencia=args.latencia)
+        url = f"http://127.0.0.1:{servidor.server_port}/v1/chat/completions"
+
+        def transmitir(pregunta):
+            mensajes = [{"role": "user", "content": pregunta}]
+            return cliente_llm.completar_stream(mensajes, "clave-falsa", url)
+
+        if nombre == "directo":
+            def consultar(pregunta):
+                return "".join(transmitir(pregunta))
+        else:
+            coordinador = CoordinadorLLM(args.concurrencia, args.cola)
+
+            def consultar(pregunta):
+                return "".join(coordinador.transmitir(pregunta, lambda: transmitir(pregunta)))
+
+        resultados = rafaga(args.sesiones, args.distintas, consultar)
+        manejador = servidor.RequestHandlerClass
+        print(f"{nombre:>12}: {resultados} | peticiones al servidor {manejador.peticiones}, "
+              f"máximo simultáneas {manejador.max_simultaneas}")
+        servidor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
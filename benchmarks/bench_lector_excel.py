@@ -0,0 +1,75 @@
+# benchmarks/bench_lector_excel.py
+#
+# Compara los motores de lectura de Excel sobre libros generados con el diseño del MTPE.
+# Uso: python -m benchmarks.bench_lector_excel [--escalas 1 10 100] [--repeticiones 5]
+
+import argparse
+import io
+import os
+import statistics
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.fixtures import FILAS_REALES, crear_fuentes
+from modules import lector_excel
+
+COLUMNAS = {
+    "ingresos": ("C:E", ['Carrera', 'Ingreso_promedio', 'Minimo_Maximo']),
+    "demanda": ("C:D", ['Carrera', 'Puestos_solicitados_2024']),
+}
+
+
+def lector_pandas(motor):
+    # Lectura anterior: filas fijas (skiprows/nrows) con pandas
+    def leer(contenido, usecols, columnas, filas):
+        return pd.read_excel(contenido, usecols=usecols, skiprows=4, nrows=filas, engine=motor)
+    return leer
+
+
+def lector_streaming(motor):
+    # Lectura actual: límites detectados, se detiene al terminar la tabla
+    def leer(contenido, usecols, columnas, filas):
+        return lector_excel.leer_tabla(contenido, usecols, columnas, motor=motor)
+    return leer
+
+
+def medir(leer, contenido, usecols, columnas, filas, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        df = leer(io.BytesIO(contenido), usecols, columnas, filas)
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos), len(df)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara los motores de lectura de Excel.")
+    parser.add_argument("--escalas", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--directorio", default=os.path.join(tempfile.gettempdir(), "carrerasperu-fixtures"))
+    args = parser.parse_args()
+
+    lectores = {
+        "pandas/openpyxl": lector_pandas("openpyxl"),
+        "streaming/openpyxl": lector_streaming("openpyxl"),
+    }
+    if lector_excel.CalamineWorkbook is not None:
+        lectores["pandas/calamine"] = lector_pandas("calamine")
+        lectores["streaming/calamine"] = lector_streaming("calamine")
+
+    print(f"{'escala':>6}  {'fuente':<24}{'lector':<22}{'filas':>7}{'mediana ms':>12}")
+    for escala in args.escalas:
+        for nombre, ruta in crear_fuentes(args.directorio, escala).items():
+            with open(ruta, "rb") as f:
+                contenido = f.read()
+            usecols, columnas = COLUMNAS[nombre.split("_")[0]]
+            filas = FILAS_REALES[nombre] * escala
+            for etiqueta, leer in lectores.items():
+                segundos, n = medir(leer, contenido, usecols, columnas, filas, args.repeticiones)
+                print(f"{escala:>6}  {nombre:<24}{etiqueta:<22}{n:>7}{segundos * 1000:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# benchmarks/bench_pipeline.py
+#
+# Mide por separado cada etapa de la carga de datos (descarga desde el CDN falso, lectura
+# del Excel, limpieza, combinación, contexto del chat y figuras) a tamaño real y escalado.
+# Uso: python -m benchmarks.bench_pipeline [--escalas 1 10 100] [--repeticiones 5]
+#      [--salida resultados.json] [--base resultados_anteriores.json]
+
+import argparse
+import io
+import json
+import statistics
+import time
+
+import pandas as pd
+import requests
+
+from benchmarks.bench_lector_excel import COLUMNAS
+from benchmarks.fixtures import crear_fuentes
+from benchmarks.servidor_cdn_falso import DIRECTORIO, iniciar
+from modules import fuentes
+from modules.contexto import IndiceContexto, construir_contexto
+from modules.graficos import FIGURAS, construir_figura, vistas_derivadas
+from modules.lector_excel import leer_tabla
+
+ETAPAS = ("descarga", "lectura", "limpieza", "combinacion", "contexto", "figuras")
+
+LIMPIEZA = {"ingresos": fuentes.limpiar_ingresos, "demanda": fuentes.limpiar_demanda}
+
+PREGUNTA = "¿Qué carreras de ingeniería tienen más demanda?"
+
+
+def ejecutar(url_base, escala):
+    """
+    Ejecuta la carga completa una vez y devuelve los segundos de cada etapa.
+    """
+    tiempos = {}
+
+    def medir(etapa, funcion):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        tiempos[etapa] = time.perf_counter() - inicio
+        return resultado
+
+    def descargar():
+        with requests.Session() as sesion:
+            return {
+                nombre: sesion.get(f"{url_base}/{nombre}_x{escala}.xlsx", timeout=30).content
+                for nombre in fuentes.FUENTES
+            }
+
+    contenidos = medir("descarga", descargar)
+    leidas = medir("lectura", lambda: {
+        nombre: leer_tabla(io.BytesIO(contenido), *COLUMNAS[fuentes.FUENTES[nombre]["tabla"]])
+        for nombre, contenido in contenidos.items()
+    })
+    limpias = medir("limpieza", lambda: {
+        nombre: LIMPIEZA[fuentes.FUENTES[nombre]["tabla"]](df) for nombre, df in leidas.items()
+    })
+
+    def combinar():
+        tablas = {tipo: fuentes.combinar(limpias[ing], limpias[dem]) for tipo, (ing, dem) in fuentes.TIPOS.items()}
+        tablas["combinado"] = pd.concat([df.assign(Tipo=tipo) for tipo, df in tablas.items()], ignore_index=True)
+        return tablas
+
+    tablas = medir("combinacion", combinar)
+    medir("contexto", lambda: (
+        construir_contexto(tablas["combinado"]),
+        IndiceContexto(tablas["combinado"]).seleccionar(PREGUNTA),
+    ))
+    medir("figuras", lambda: [
+        construir_figura(nombre, vistas_derivadas(tablas[tipo])).to_json()
+        for tipo in fuentes.TIPOS for nombre in FIGURAS
+    ])
+    return tiempos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tiempos por etapa de la carga de datos.")
+    parser.add_argument("--escalas", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--directorio", default=DIRECTORIO)
+    parser.add_argument("--salida", help="guarda las medianas en JSON para compararlas luego")
+    parser.add_argument("--base", help="JSON de una corrida anterior; muestra la variación por etapa")
+    args = parser.parse_args()
+
+    base = {}
+    if args.base:
+        with open(args.base, encoding="utf-8") as f:
+            base = json.load(f)
+
+    servidor = iniciar(args.directorio)
+    url_base = f"http://127.0.0.1:{servidor.server_port}"
+    resultados = {}
+    try:
+        print(f"{'escala':>6}  {'etapa':<12}{'mediana ms':>12}{'variación':>11}")
+        for escala in args.escalas:
+            crear_fuentes(args.directorio, escala)
+            corridas = [ejecutar(url_base, escala) for _ in range(args.repeticiones)]
+            resultados[str(escala)] = {}
+            for etapa in ETAPAS:
+                mediana = statistics.median(c[etapa] for c in corridas) * 1000
+                resultados[str(escala)][etapa] = round(mediana, 3)
+                anterior = base.get(str(escala), {}).get(etapa)
+                variacion = f"{(mediana / anterior - 1) * 100:+.0f}%" if anterior else ""
+                print(f"{escala:>6}  {etapa:<12}{mediana:>12.1f}{variacion:>11}")
+    finally:
+        servidor.shutdown()
+
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
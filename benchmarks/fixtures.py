@@ -0,0 +1,71 @@
+# benchmarks/fixtures.py
+
+import os
+import random
+
+from openpyxl import Workbook
+
+# Número de filas de cada tabla en la edición nacional 2024
+FILAS_REALES = {
+    "ingresos_universitaria": 68,
+    "demanda_universitaria": 60,
+    "ingresos_tecnica": 31,
+    "demanda_tecnica": 39,
+}
+
+
+def _soles(valor):
+    # Formato del MTPE: "S/ 1 234" con espacio como separador de miles
+    return "S/ " + f"{valor:,}".replace(",", " ")
+
+
+def crear_libro(destino, tabla, filas, filas_notas=20, semilla=0):
+    """
+    Genera un libro con el mismo diseño que los del MTPE: títulos en las
+    filas 1 a 4, encabezado en la fila 5, datos desde la columna C y notas
+    al pie debajo de la tabla. `destino` puede ser una ruta o un buffer.
+    """
+    rng = random.Random(semilla)
+    wb = Workbook()
+    ws = wb.active
+    ws["B1"] = "PERÚ: TABLA GENERADA PARA PRUEBAS DE RENDIMIENTO"
+    ws["B2"] = "(Soles)" if tabla == "ingresos" else "(Número de puestos)"
+
+    encabezado = ["Familia de carreras (1)"]
+    encabezado += ["Remuneración promedio", "Mínimo - Máximo (2)"] if tabla == "ingresos" else ["Puestos solicitados"]
+    for columna, texto in enumerate(encabezado, start=3):
+        ws.cell(5, columna, texto)
+
+    for i in range(filas):
+        fila = 6 + i
+        ws.cell(fila, 3, f"Carrera {i:05d}")
+        if tabla == "ingresos":
+            promedio = rng.randint(12, 120) * 100
+            ws.cell(fila, 4, _soles(promedio))
+            ws.cell(fila, 5, f"{_soles(promedio // 2 // 100 * 100)} - {_soles(promedio * 2)}")
+        else:
+            ws.cell(fila, 4, rng.randint(5, 20000))
+
+    fila = 6 + filas + 1
+    ws.cell(fila, 2, "Notas:")
+    for j in range(filas_notas):
+        ws.cell(fila + 1 + j, 2, f"({j + 1}) Nota al pie número {j + 1} del cuadro.")
+    ws.cell(fila + 1 + filas_notas, 2, "Fuente: MTPE - Planilla Electrónica.")
+
+    wb.save(destino)
+
+
+def crear_fuentes(directorio, escala=1, filas_notas=20):
+    """
+    Genera los cuatro libros en `directorio` con `escala` veces sus filas
+    reales. Devuelve {nombre_fuente: ruta}.
+    """
+    os.makedirs(directorio, exist_ok=True)
+    rutas = {}
+    for semilla, (nombre, filas) in enumerate(FILAS_REALES.items()):
+        tabla = nombre.split("_")[0]
+        ruta = os.path.join(directorio, f"{nombre}_x{escala}.xlsx")
+        if not os.path.exists(ruta):
+            crear_libro(ruta, tabla, filas * escala, filas_notas=filas_notas, semilla=semilla)
+        rutas[nombre] = ruta
+    return rutas
@@ -0,0 +1,108 @@
+# benchmarks/servidor_cdn_falso.py
+#
+# Servidor local que reemplaza al CDN de gob.pe: sirve los libros de un directorio con
+# ETag y Last-Modified (responde 304 a las peticiones condicionales) y latencia configurable.
+# Uso: python -m benchmarks.servidor_cdn_falso [--directorio DIR] [--escalas 1 10] [--puerto 8800]
+# y luego: CARRERAS_URL_FUENTES="http://127.0.0.1:8800/{nombre}_x1.xlsx" streamlit run carrerasperu.py
+
+import argparse
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.fixtures import crear_fuentes
+
+DIRECTORIO = os.path.join(tempfile.gettempdir(), "carrerasperu-fixtures")
+
+
+class ManejadorCDN(BaseHTTPRequestHandler):
+    directorio = DIRECTORIO
+    latencia = 0.0
+    peticiones = 0
+    no_modificados = 0
+    _lock = threading.Lock()
+
+    def log_message(self, formato, *args):
+        pass
+
+    def do_GET(self):
+        clase = type(self)
+        with self._lock:
+            clase.peticiones += 1
+        time.sleep(self.latencia)
+
+        ruta = os.path.join(self.directorio, os.path.basename(self.path.split("?")[0]))
+        if not os.path.isfile(ruta):
+            self.send_error(404)
+            return
+        estado = os.stat(ruta)
+        etag = '"' + hashlib.sha1(f"{estado.st_mtime_ns}-{estado.st_size}".encode()).hexdigest()[:16] + '"'
+        modificado = formatdate(int(estado.st_mtime), usegmt=True)
+
+        if self._no_modificado(etag, int(estado.st_mtime)):
+            with self._lock:
+                clase.no_modificados += 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        with open(ruta, "rb") as f:
+            datos = f.read()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+        self.send_header("Content-Length", str(len(datos)))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", modificado)
+        self.end_headers()
+        self.wfile.write(datos)
+
+    def _no_modificado(self, etag, mtime):
+        if self.headers.get("If-None-Match"):
+            return self.headers["If-None-Match"] == etag
+        if self.headers.get("If-Modified-Since"):
+            try:
+                return mtime <= parsedate_to_datetime(self.headers["If-Modified-Since"]).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+
+def iniciar(directorio=DIRECTORIO, puerto=0, latencia=0.0):
+    """
+    Inicia el servidor en un hilo y lo devuelve; cada libro se sirve en
+    f"http://127.0.0.1:{servidor.server_port}/<archivo>".
+    """
+    manejador = type("Manejador", (ManejadorCDN,), {
+        "directorio": directorio, "latencia": latencia, "peticiones": 0, "no_modificados": 0,
+        "_lock": threading.Lock(),
+    })
+    servidor = ThreadingHTTPServer(("127.0.0.1", puerto), manejador)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CDN falso con los libros de prueba.")
+    parser.add_argument("--directorio", default=DIRECTORIO)
+    parser.add_argument("--escalas", type=int, nargs="+", default=[1])
+    parser.add_argument("--puerto", type=int, default=8800)
+    parser.add_argument("--latencia", type=float, default=0.0)
+    args = parser.parse_args()
+    for escala in args.escalas:
+        crear_fuentes(args.directorio, escala)
+    servidor = iniciar(args.directorio, args.puerto, args.latencia)
+    print(f"Sirviendo {args.directorio} en http://127.0.0.1:{servidor.server_port}/")
+    print(f'CARRERAS_URL_FUENTES="http://127.0.0.1:{servidor.server_port}/{{nombre}}_x{args.escalas[0]}.xlsx"')
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        servidor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# benchmarks/servidor_llm_falso.py
+#
+# Servidor local compatible con /v1/chat/completions para probar el cliente del chat
+# sin llamar a RapidAPI. Responde con eco de la pregunta, con latencia y fallas configurables.
+# Uso: python -m benchmarks.servidor_llm_falso [--puerto 8799] [--latencia 0.5] [--fallos 2]
+# y en .streamlit/secrets.toml: [RAPIDAPI] url = "http://127.0.0.1:8799/v1/chat/completions"
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class ManejadorLLM(BaseHTTPRequestHandler):
+    latencia = 0.0           # segundos antes de responder (o antes del primer fragmento)
+    latencia_fragmento = 0.02
+    fallos = 0               # cuántas peticiones iniciales responden 503
+    estado_fallo = 503
+    peticiones = 0
+    en_curso = 0
+    max_simultaneas = 0      # máximo de peticiones atendidas a la vez
+    _lock = threading.Lock()
+
+    def log_message(self, formato, *args):
+        pass
+
+    def do_POST(self):
+        clase = type(self)
+        with self._lock:
+            clase.peticiones += 1
+            clase.en_curso += 1
+            clase.max_simultaneas = max(clase.max_simultaneas, clase.en_curso)
+            numero = clase.peticiones
+        try:
+            self._responder(numero)
+        finally:
+            with self._lock:
+                clase.en_curso -= 1
+
+    def _responder(self, numero):
+        cuerpo = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+
+        if numero <= self.fallos:
+            self.send_response(self.estado_fallo)
+            self.send_header("Retry-After", "0")
+            self.end_headers()
+            return
+
+        time.sleep(self.latencia)
+        pregunta = cuerpo.get("messages", [{}])[-1].get("content", "")
+        texto = f"Respuesta de prueba a: {pregunta.strip()[-80:]}"
+
+        if not cuerpo.get("stream"):
+            datos = json.dumps({"choices": [{"message": {"role": "assistant", "content": texto}}]},
+                               ensure_ascii=False).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(datos)))
+            self.end_headers()
+            self.wfile.write(datos)
+            return
+
+        # Como los servidores reales: UTF-8 sin escapar y sin charset en el Content-Type
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        for palabra in texto.split(" "):
+            evento = {"choices": [{"delta": {"content": palabra + " "}}]}
+            self.wfile.write(f"data: {json.dumps(evento, ensure_ascii=False)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+            time.sleep(self.latencia_fragmento)
+        self.wfile.write(b"data: [DONE]\n\n")
+
+
+def iniciar(puerto=0, latencia=0.0, fallos=0, estado_fallo=503):
+    """
+    Inicia el servidor en un hilo y lo devuelve; la URL del endpoint es
+    f"http://127.0.0.1:{servidor.server_port}/v1/chat/completions".
+    """
+    manejador = type("Manejador", (ManejadorLLM,), {
+        "latencia": latencia, "fallos": fallos, "estado_fallo": estado_fallo, "peticiones": 0,
+        "en_curso": 0, "max_simultaneas": 0, "_lock": threading.Lock(),
+    })
+    servidor = ThreadingHTTPServer(("127.0.0.1", puerto), manejador)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Endpoint de chat falso para pruebas locales.")
+    parser.add_argument("--puerto", type=int, default=8799)
+    parser.add_argument("--latencia", type=float, default=0.5)
+    parser.add_argument("--fallos", type=int, default=0)
+    args = parser.parse_args()
+    servidor = iniciar(args.puerto, args.latencia, args.fallos)
+    print(f"Escuchando en http://127.0.0.1:{servidor.server_port}/v1/chat/completions")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        servidor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# exportar.py
+#
+# Exporta sin Streamlit las tablas combinadas y los ocho gráficos como archivos estáticos,
+# para servir el contenido de solo lectura desde un CDN.
+# Uso: python exportar.py [--salida exportado] [--forzar]
+#
+# Es incremental: cada archivo se vuelve a escribir solo si cambió la huella de
+# los datos de los que sale (o VERSION_EXPORTACION).
+
+import argparse
+import hashlib
+import json
+import os
+
+from modules import almacen
+from modules.cache_datos import escribir_atomico
+from modules.fuentes import TIPOS, refrescar_tablas
+from modules.graficos import FIGURAS, construir_figura, vistas_derivadas
+
+# Subir este número cuando cambie el formato de las tablas o de los gráficos exportados
+VERSION_EXPORTACION = 1
+
+
+def _huella(*partes):
+    return hashlib.sha256("\0".join(map(str, (VERSION_EXPORTACION, *partes))).encode("utf-8")).hexdigest()[:16]
+
+
+def salidas(manifiesto_datos):
+    """
+    Archivos a exportar: ruta relativa -> (huella de su fuente, función que lo escribe en una ruta).
+    """
+    tablas = {}
+    vistas = {}
+
+    def tabla(tipo):
+        if tipo not in tablas:
+            tablas[tipo] = almacen.leer(manifiesto_datos["tablas"][tipo])
+        return tablas[tipo]
+
+    def figura(tipo, nombre):
+        if tipo not in vistas:
+            vistas[tipo] = vistas_derivadas(tabla(tipo))
+        return construir_figura(nombre, vistas[tipo])
+
+    archivos = {}
+    for tipo in TIPOS:
+        version = manifiesto_datos["tablas"][tipo]["version"]
+        archivos[f"tablas/{tipo}.parquet"] = (
+            _huella(version, "parquet"), lambda ruta, tipo=tipo: tabla(tipo).to_parquet(ruta, index=False)
+        )
+        archivos[f"tablas/{tipo}.csv"] = (
+            _huella(version, "csv"), lambda ruta, tipo=tipo: tabla(tipo).to_csv(ruta, index=False)
+        )
+        for nombre in FIGURAS:
+            archivos[f"figuras/{tipo}_{nombre}.html"] = (
+                _huella(version, nombre, "html"),
+                lambda ruta, tipo=tipo, nombre=nombre: figura(tipo, nombre).write_html(
+                    ruta, include_plotlyjs="cdn", full_html=True
+                ),
+            )
+            archivos[f"figuras/{tipo}_{nombre}.json"] = (
+                _huella(version, nombre, "json"),
+                lambda ruta, tipo=tipo, nombre=nombre: _escribir_texto(ruta, figura(tipo, nombre).to_json()),
+            )
+    return archivos
+
+
+def _escribir_texto(ruta, texto):
+    with open(ruta, "w", encoding="utf-8") as f:
+        f.write(texto)
+
+
+def exportar(directorio, forzar=False):
+    """
+    Escribe en `directorio` los archivos cuya huella cambió desde la última
+    exportación. Devuelve {ruta relativa: "escrito" | "sin cambios"}.
+    """
+    ruta_manifiesto = os.path.join(directorio, "manifiesto.json")
+    try:
+        with open(ruta_manifiesto, encoding="utf-8") as f:
+            anterior = json.load(f)
+    except (OSError, ValueError):
+        anterior = {}
+
+    resultado = {}
+    manifiesto = {}
+    for relativa, (huella, escribir) in salidas(almacen.asegurar(refrescar_tablas)).items():
+        ruta = os.path.join(directorio, relativa)
+        manifiesto[relativa] = huella
+        if not forzar and anterior.get(relativa) == huella and os.path.exists(ruta):
+            resultado[relativa] = "sin cambios"
+            continue
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        escribir_atomico(ruta, escribir)
+        resultado[relativa] = "escrito"
+
+    escribir_atomico(ruta_manifiesto, lambda tmp: _escribir_texto(tmp, json.dumps(manifiesto, indent=2)))
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exporta tablas y gráficos como archivos estáticos.")
+    parser.add_argument("--salida", default="exportado", help="directorio de salida")
+    parser.add_argument("--forzar", action="store_true", help="reescribe todo aunque no haya cambios")
+    args = parser.parse_args()
+
+    resultado = exportar(args.salida, args.forzar)
+    for relativa, estado in sorted(resultado.items()):
+        print(f"{estado:<12} {relativa}")
+    escritos = sum(estado == "escrito" for estado in resultado.values())
+    print(f"{escritos} archivos escritos, {len(resultado) - escritos} sin cambios en {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
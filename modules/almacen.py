@@ -0,0 +1,156 @@
+# modules/almacen.py
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+import pyarrow.feather as feather
+
+from modules import metricas
+from modules.cache_datos import CACHE_DIR, MAX_EDAD, escribir_atomico, modo_offline
+
+try:
+    import fcntl
+except ImportError:  # Windows: sin bloqueo entre procesos, solo entre hilos
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Directorio compartido por todas las réplicas (un volumen común): tablas Arrow + manifiesto
+ALMACEN_DIR = os.environ.get("CARRERAS_ALMACEN_DIR", os.path.join(os.path.dirname(CACHE_DIR), "almacen"))
+
+# Segundos entre revisiones del manifiesto en cada proceso
+INTERVALO_REVISION = int(os.environ.get("CARRERAS_ALMACEN_REVISION", 60))
+
+# Subir este número cuando cambien las tablas que se publican: los manifiestos
+# de otro formato se ignoran y el primer proceso vuelve a publicar
+FORMATO = 2
+
+_lock_proceso = threading.Lock()
+
+
+def huella_dataframe(df):
+    """
+    Huella del contenido de un DataFrame; cambia solo si cambian sus datos.
+    """
+    valores = pd.util.hash_pandas_object(df, index=True).values
+    return hashlib.sha256(valores.tobytes()).hexdigest()[:16]
+
+
+def _ruta(nombre):
+    return os.path.join(ALMACEN_DIR, nombre)
+
+
+def leer_manifiesto():
+    """
+    Manifiesto del almacén (tablas publicadas y fecha de actualización), o None
+    si no existe o es de otro formato.
+    """
+    try:
+        with open(_ruta("manifiesto.json"), encoding="utf-8") as f:
+            manifiesto = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifiesto if manifiesto.get("formato") == FORMATO else None
+
+
+def _vigente(manifiesto):
+    return manifiesto is not None and (modo_offline() or time.time() - manifiesto["actualizado"] < MAX_EDAD)
+
+
+@contextmanager
+def _bloqueo(esperar):
+    # Bloqueo de archivo entre procesos (y réplicas que comparten el volumen);
+    # con esperar=False devuelve False si otro proceso ya lo tiene
+    os.makedirs(ALMACEN_DIR, exist_ok=True)
+    with open(_ruta(".lock"), "a") as archivo:
+        if fcntl is None:
+            yield True
+            return
+        try:
+            fcntl.flock(archivo, fcntl.LOCK_EX | (0 if esperar else fcntl.LOCK_NB))
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(archivo, fcntl.LOCK_UN)
+
+
+def asegurar(refrescar):
+    """
+    Devuelve el manifiesto vigente. Si falta o venció, un solo proceso ejecuta
+    `refrescar()` (que devuelve {nombre: DataFrame}) y publica las tablas; los
+    demás siguen sirviendo las tablas actuales o, si aún no hay ninguna,
+    esperan a que termine la primera publicación.
+    """
+    manifiesto = leer_manifiesto()
+    if _vigente(manifiesto):
+        metricas.contar_cache("almacen", True)
+        return manifiesto
+    with _lock_proceso:
+        manifiesto = leer_manifiesto()
+        if _vigente(manifiesto):
+            metricas.contar_cache("almacen", True)
+            return manifiesto
+        with _bloqueo(esperar=manifiesto is None) as adquirido:
+            if not adquirido:
+                metricas.contar_cache("almacen", True)
+                return manifiesto
+            # Otro proceso pudo publicar mientras se esperaba el bloqueo
+            manifiesto = leer_manifiesto()
+            if _vigente(manifiesto):
+                metricas.contar_cache("almacen", True)
+                return manifiesto
+            metricas.contar_cache("almacen", False)
+            try:
+                tablas = refrescar()
+            except Exception as e:
+                if manifiesto is None:
+                    raise
+                logger.warning("No se pudo refrescar el almacén (%s); se sirven las tablas actuales", e)
+                return manifiesto
+            with metricas.tramo("publicacion"):
+                return _publicar(tablas, manifiesto)
+
+
+def _publicar(tablas, anterior):
+    entradas = {}
+    for nombre, df in tablas.items():
+        version = huella_dataframe(df)
+        archivo = f"{nombre}-{version}.arrow"
+        # Sin compresión, para que los lectores mapeen el archivo en memoria sin descomprimirlo
+        if not os.path.exists(_ruta(archivo)):
+            escribir_atomico(_ruta(archivo), lambda tmp, df=df: feather.write_feather(df, tmp, compression="uncompressed"))
+        entradas[nombre] = {"archivo": archivo, "version": version}
+
+    manifiesto = {"formato": FORMATO, "actualizado": time.time(), "tablas": entradas}
+
+    def escribir(tmp):
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifiesto, f)
+    escribir_atomico(_ruta("manifiesto.json"), escribir)
+
+    # Se conservan también las tablas del manifiesto anterior: otro proceso puede estar abriéndolas
+    en_uso = {e["archivo"] for m in (manifiesto, anterior or {"tablas": {}}) for e in m["tablas"].values()}
+    for archivo in os.listdir(ALMACEN_DIR):
+        if archivo.endswith(".arrow") and archivo not in en_uso:
+            try:
+                os.remove(_ruta(archivo))
+            except OSError:
+                pass
+    return manifiesto
+
+
+def leer(entrada):
+    """
+    Lee una tabla publicada (una entrada del manifiesto) mapeando el archivo en memoria.
+    """
+    with metricas.tramo("lectura_almacen"):
+        return feather.read_table(_ruta(entrada["archivo"]), memory_map=True).to_pandas()
@@ -0,0 +1,131 @@
+# modules/cache_datos.py
+
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+import time
+
+import pandas as pd
+import requests
+
+from modules import metricas
+
+logger = logging.getLogger(__name__)
+
+# Directorio donde se guardan los snapshots (Parquet + metadatos de revalidación)
+CACHE_DIR = os.environ.get(
+    "CARRERAS_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "datasets"),
+)
+
+# Segundos durante los cuales un snapshot se usa sin consultar al CDN
+MAX_EDAD = int(os.environ.get("CARRERAS_CACHE_MAX_EDAD", 6 * 60 * 60))
+
+# Subir este número cuando cambie el formato de las tablas procesadas para descartar snapshots viejos
+VERSION_SNAPSHOT = 4
+
+# Timeout (conexión, lectura) de la descarga; si el CDN tarda más se sirve el snapshot
+TIMEOUT = (5, float(os.environ.get("CARRERAS_TIMEOUT", 20)))
+
+
+def modo_offline():
+    """
+    Indica si se deben servir los snapshots sin contactar al CDN.
+    """
+    return os.environ.get("CARRERAS_OFFLINE", "").lower() in ("1", "true", "si", "sí")
+
+
+def _rutas(url, clave):
+    nombre = f"{clave}-v{VERSION_SNAPSHOT}-{hashlib.sha1(url.encode('utf-8')).hexdigest()[:12]}"
+    base = os.path.join(CACHE_DIR, nombre)
+    return base + ".parquet", base + ".json"
+
+
+def _leer_meta(ruta_meta):
+    try:
+        with open(ruta_meta, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def escribir_atomico(ruta, escribir):
+    # Escribir en un temporal y renombrar para no dejar snapshots a medias. El temporal
+    # lleva el hilo además del proceso: varios hilos pueden escribir la misma ruta a la vez
+    tmp = f"{ruta}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        escribir(tmp)
+        os.replace(tmp, ruta)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _guardar_meta(ruta_meta, meta):
+    def escribir(tmp):
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+    escribir_atomico(ruta_meta, escribir)
+
+
+def cargar_snapshot(url, parser, clave):
+    """
+    Devuelve el DataFrame resultante de aplicar `parser` al archivo de `url`,
+    usando un snapshot en disco que se revalida con ETag/Last-Modified.
+
+    `parser` recibe el contenido descargado (BytesIO) y `clave` identifica el
+    tipo de tabla para que distintos parsers de la misma URL no se mezclen.
+    """
+    ruta_parquet, ruta_meta = _rutas(url, clave)
+    meta = _leer_meta(ruta_meta)
+    existe = meta is not None and os.path.exists(ruta_parquet)
+
+    if existe and (modo_offline() or time.time() - meta.get("validado", 0) < MAX_EDAD):
+        metricas.contar_cache("snapshot", True)
+        return pd.read_parquet(ruta_parquet)
+
+    # Revalidación condicional: el CDN responde 304 si el archivo no cambió
+    headers = {}
+    if existe:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    try:
+        with metricas.tramo("descarga"):
+            response = requests.get(url, headers=headers, timeout=TIMEOUT)
+        if response.status_code == 304 and existe:
+            metricas.contar_cache("snapshot", True)
+            meta["validado"] = time.time()
+            _guardar_meta(ruta_meta, meta)
+            return pd.read_parquet(ruta_parquet)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        if existe:
+            metricas.contar_cache("snapshot", True)
+            logger.warning("No se pudo revalidar %s (%s); se usa el último snapshot", url, e)
+            return pd.read_parquet(ruta_parquet)
+        raise
+
+    metricas.contar_cache("snapshot", False)
+    with metricas.tramo("lectura"):
+        df = parser(io.BytesIO(response.content))
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    escribir_atomico(ruta_parquet, lambda tmp: df.to_parquet(tmp, index=False))
+    ahora = time.time()
+    _guardar_meta(ruta_meta, {
+        "url": url,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "descargado": ahora,
+        "validado": ahora,
+    })
+    return df
@@ -0,0 +1,178 @@
+# modules/cache_respuestas.py
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from modules import metricas
+from modules.limpieza import normalizar_pregunta
+
+RUTA = os.environ.get(
+    "CARRERAS_CACHE_RESPUESTAS",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "respuestas.sqlite3"),
+)
+MAX_MEMORIA = int(os.environ.get("CARRERAS_CACHE_RESPUESTAS_MEMORIA", 256))
+MAX_DISCO = int(os.environ.get("CARRERAS_CACHE_RESPUESTAS_DISCO", 5000))
+TTL = int(os.environ.get("CARRERAS_CACHE_RESPUESTAS_TTL", 7 * 24 * 60 * 60))
+
+
+def huella_texto(texto):
+    return hashlib.sha256(texto.encode("utf-8")).hexdigest()[:16]
+
+
+def huella_conversacion(mensajes):
+    """
+    Huella de los turnos previos que acompañan a una pregunta, o "" si no hay ninguno.
+    """
+    if not mensajes:
+        return ""
+    return huella_texto("\0".join(f"{m['role']}\0{m['content']}" for m in mensajes))
+
+
+class CacheRespuestas:
+    """
+    Caché de respuestas del chat en dos niveles: un LRU en memoria delante
+    de una tabla SQLite en disco con TTL y tamaño máximo.
+
+    Cada entrada se guarda con la huella del contexto (los datos) con que se
+    generó; al aparecer una huella nueva se descartan las entradas anteriores.
+    La huella de la conversación, si la hay, solo forma parte de la clave: una
+    pregunta de seguimiento no reutiliza la respuesta dada en otra conversación.
+    """
+
+    def __init__(self, ruta=RUTA, max_memoria=MAX_MEMORIA, max_disco=MAX_DISCO, ttl=TTL):
+        self.ruta = ruta
+        self.max_memoria = max_memoria
+        self.max_disco = max_disco
+        self.ttl = ttl
+        self._memoria = OrderedDict()
+        self._huella = None
+        self._lock = threading.Lock()
+        self.contadores = {"aciertos_memoria": 0, "aciertos_disco": 0, "fallos": 0}
+        directorio = os.path.dirname(ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        with self._conectar() as conexion:
+            conexion.execute(
+                "CREATE TABLE IF NOT EXISTS respuestas ("
+                "clave TEXT PRIMARY KEY, huella TEXT, respuesta TEXT, creado REAL, usado REAL)"
+            )
+
+    @contextmanager
+    def _conectar(self):
+        # Una conexión por operación: las sesiones de Streamlit corren en hilos distintos
+        conexion = sqlite3.connect(self.ruta, timeout=5)
+        try:
+            with conexion:
+                yield conexion
+        finally:
+            conexion.close()
+
+    def _clave(self, pregunta, huella, conversacion=""):
+        texto = f"{normalizar_pregunta(pregunta)}\0{huella}"
+        if conversacion:
+            texto += f"\0{conversacion}"
+        return hashlib.sha256(texto.encode("utf-8")).hexdigest()
+
+    def _verificar_huella(self, huella):
+        # Los datos cambiaron: las respuestas anteriores ya no son válidas
+        if huella == self._huella:
+            return
+        self._memoria.clear()
+        with self._conectar() as conexion:
+            conexion.execute("DELETE FROM respuestas WHERE huella != ?", (huella,))
+        self._huella = huella
+
+    def _contar(self, contador):
+        self.contadores[contador] += 1
+        metricas.contar_cache("respuestas", contador != "fallos")
+
+    def obtener(self, pregunta, huella, conversacion=""):
+        """
+        Devuelve la respuesta guardada para `pregunta` con el contexto `huella`
+        tras la conversación `conversacion` (ver huella_conversacion), o None.
+        """
+        clave = self._clave(pregunta, huella, conversacion)
+        with self._lock:
+            self._verificar_huella(huella)
+            if clave in self._memoria:
+                respuesta, creado = self._memoria[clave]
+                # El TTL cuenta desde que se generó la respuesta, igual que en disco
+                if creado >= time.time() - self.ttl:
+                    self._memoria.move_to_end(clave)
+                    self._contar("aciertos_memoria")
+                    return respuesta
+                del self._memoria[clave]
+
+        ahora = time.time()
+        with self._conectar() as conexion:
+            fila = conexion.execute(
+                "SELECT respuesta, creado FROM respuestas WHERE clave = ? AND creado >= ?", (clave, ahora - self.ttl)
+            ).fetchone()
+            if fila:
+                conexion.execute("UPDATE respuestas SET usado = ? WHERE clave = ?", (ahora, clave))
+
+        with self._lock:
+            if fila is None:
+                self._contar("fallos")
+                return None
+            self._contar("aciertos_disco")
+            self._recordar(clave, fila[0], fila[1])
+        return fila[0]
+
+    def guardar(self, pregunta, huella, respuesta, conversacion=""):
+        """
+        Guarda la respuesta en memoria y en disco, respetando el TTL y el tamaño máximo.
+        """
+        clave = self._clave(pregunta, huella, conversacion)
+        ahora = time.time()
+        with self._lock:
+            self._verificar_huella(huella)
+            self._recordar(clave, respuesta, ahora)
+        with self._conectar() as conexion:
+            conexion.execute(
+                "INSERT OR REPLACE INTO respuestas VALUES (?, ?, ?, ?, ?)", (clave, huella, respuesta, ahora, ahora)
+            )
+            conexion.execute("DELETE FROM respuestas WHERE creado < ?", (ahora - self.ttl,))
+            # Tamaño máximo: se descartan las menos usadas recientemente
+            conexion.execute(
+                "DELETE FROM respuestas WHERE clave IN ("
+                "SELECT clave FROM respuestas ORDER BY usado DESC LIMIT -1 OFFSET ?)", (self.max_disco,)
+            )
+
+    def _recordar(self, clave, respuesta, creado):
+        self._memoria[clave] = (respuesta, creado)
+        self._memoria.move_to_end(clave)
+        while len(self._memoria) > self.max_memoria:
+            self._memoria.popitem(last=False)
+
+    def estadisticas(self):
+        """
+        Contadores de aciertos y fallos, y la tasa de aciertos total.
+        """
+        with self._lock:
+            estadisticas = dict(self.contadores)
+        consultas = sum(estadisticas.values())
+        aciertos = estadisticas["aciertos_memoria"] + estadisticas["aciertos_disco"]
+        estadisticas["tasa_aciertos"] = aciertos / consultas if consultas else 0.0
+        return estadisticas
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def obtener_cache_respuestas():
+    """
+    Devuelve el caché de respuestas compartido por todas las sesiones del proceso.
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = CacheRespuestas()
+    return _cache
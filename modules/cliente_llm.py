@@ -0,0 +1,112 @@
+# modules/cliente_llm.py
+
+import json
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+HOST = "cheapest-gpt-4-turbo-gpt-4-vision-chatgpt-openai-ai-api.p.rapidapi.com"
+URL = f"https://{HOST}/v1/chat/completions"
+
+# (conexión, lectura) en segundos; la lectura cubre el tiempo entre fragmentos al transmitir
+TIMEOUT = (
+    float(os.environ.get("CARRERAS_LLM_TIMEOUT_CONEXION", 5)),
+    float(os.environ.get("CARRERAS_LLM_TIMEOUT_LECTURA", 60)),
+)
+
+# Reintentos acotados con backoff exponencial ante 429/5xx y fallas de conexión.
+# No se reintentan timeouts de lectura: la petición pudo llegar y se cobraría dos veces.
+REINTENTOS = Retry(
+    total=3,
+    connect=3,
+    read=0,
+    status=3,
+    backoff_factor=0.5,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset({"POST"}),
+    respect_retry_after_header=True,
+    raise_on_status=False,
+)
+
+_sesion = None
+_sesion_lock = threading.Lock()
+
+
+def obtener_sesion():
+    """
+    Devuelve la sesión HTTP compartida por el proceso (pool de conexiones y reintentos).
+    """
+    global _sesion
+    if _sesion is None:
+        with _sesion_lock:
+            if _sesion is None:
+                sesion = requests.Session()
+                adaptador = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=REINTENTOS)
+                sesion.mount("https://", adaptador)
+                sesion.mount("http://", adaptador)
+                _sesion = sesion
+    return _sesion
+
+
+def _headers(api_key):
+    return {
+        "x-rapidapi-key": api_key,
+        "x-rapidapi-host": HOST,
+        "Content-Type": "application/json"
+    }
+
+
+def _payload(mensajes, stream):
+    return {
+        "messages": mensajes,
+        "model": "gpt-4",
+        "max_tokens": 1000,
+        "temperature": 0.7,
+        "stream": stream,
+    }
+
+
+def completar(mensajes, api_key, url=URL):
+    """
+    Envía `mensajes` al endpoint de chat y devuelve la respuesta completa.
+    Lanza requests.RequestException si la petición falla tras los reintentos.
+    """
+    response = obtener_sesion().post(
+        url, json=_payload(mensajes, False), headers=_headers(api_key), timeout=TIMEOUT
+    )
+    response.raise_for_status()
+    return response.json()['choices'][0]['message']['content'].strip()
+
+
+def completar_stream(mensajes, api_key, url=URL):
+    """
+    Igual que `completar`, pero genera la respuesta fragmento a fragmento
+    (server-sent events). Si el servidor no transmite, genera la respuesta
+    completa en un solo fragmento.
+    """
+    response = obtener_sesion().post(
+        url, json=_payload(mensajes, True), headers=_headers(api_key), timeout=TIMEOUT, stream=True
+    )
+    try:
+        response.raise_for_status()
+        if "text/event-stream" not in response.headers.get("Content-Type", ""):
+            yield response.json()['choices'][0]['message']['content'].strip()
+            return
+
+        # Los eventos SSE siempre van en UTF-8; sin charset en el Content-Type, requests
+        # decodificaría como ISO-8859-1, así que cada línea se decodifica aquí
+        for linea in response.iter_lines():
+            linea = linea.decode("utf-8")
+            if not linea or not linea.startswith("data:"):
+                continue
+            datos = linea[len("data:"):].strip()
+            if datos == "[DONE]":
+                break
+            fragmento = json.loads(datos)['choices'][0].get('delta', {}).get('content')
+            if fragmento:
+                yield fragmento
+    finally:
+        response.close()
@@ -0,0 +1,308 @@
+# modules/consultas.py
+
+import re
+from difflib import SequenceMatcher
+
+import numpy as np
+import pandas as pd
+
+from modules.limpieza import ALIAS, normalizar_carrera, normalizar_pregunta
+
+# Métricas reconocidas: columna -> (frases que la identifican, descripción, es monto en soles).
+# El orden importa: "ingreso minimo" debe detectarse antes que "ingreso".
+METRICAS = {
+    'Ingreso_Minimo': (("ingreso minimo", "sueldo minimo", "salario minimo", "remuneracion minima", "minimo de ingreso"),
+                       "ingreso mínimo", True),
+    'Ingreso_Maximo': (("ingreso maximo", "sueldo maximo", "salario maximo", "remuneracion maxima", "maximo de ingreso"),
+                       "ingreso máximo", True),
+    'Ingreso_promedio': (("ingreso", "ingresos", "sueldo", "salario", "remuneracion", "gana", "ganan", "pagan", "paga"),
+                         "ingreso promedio", True),
+    'Puestos_solicitados_2024': (("puestos", "puesto", "demanda", "demandada", "demandadas", "vacantes", "empleos", "solicitad"),
+                                 "puestos solicitados en 2024", False),
+}
+
+_MAYOR = ("mayor", "mas alto", "mas alta", "mas altos", "mas altas", "maximo", "maxima", "mejor", "mejores",
+          "mas", "top", "primeras", "primeros", "mas demandadas", "mas demandada")
+_MENOR = ("menor", "mas bajo", "mas baja", "mas bajos", "mas bajas", "minimo", "minima", "peor", "peores",
+          "menos", "ultimas", "ultimos")
+
+_TIPOS = {
+    "universitaria": ("universitaria", "universitarias", "universitario", "universitarios", "universidad"),
+    "tecnica": ("tecnica", "tecnicas", "tecnico", "tecnicos", "instituto"),
+}
+
+# Preguntas que piden todos los datos de una carrera, sin una métrica concreta
+_RESUMEN = ("datos", "informacion", "resumen", "cifras", "estadisticas")
+
+_NUMEROS = {"dos": 2, "tres": 3, "cuatro": 4, "cinco": 5, "seis": 6, "siete": 7, "ocho": 8, "nueve": 9, "diez": 10}
+
+# Preguntas que el motor no sabe responder y que van al modelo: comparaciones ("más
+# demanda que Medicina"), umbrales ("más de 5000 soles", "entre 2000 y 3000"), conteos
+# ("cuántas carreras") y varias métricas a la vez ("el ingreso máximo y mínimo")
+_PARA_EL_MODELO = [re.compile(patron) for patron in (
+    r'\b(?:mas|menos|mayor|menor)\b.*\bque\b',
+    r'\b(?:mas|menos|mayor|menor|superior|inferior)(?:es)? (?:de|a) (?:s )?\d',
+    r'\b(?:entre|sobre|encima de|debajo de|al menos|hasta) (?:s )?\d',
+    r'\b(?:cuantas|cuantos|numero de|cantidad de) (?:carreras|profesiones)\b',
+    r'\b(?:minim[oa]|maxim[oa]|promedio)s? (?:y|e|o|vs|versus) (?:el |la |los |las )?(?:minim[oa]|maxim[oa]|promedio)',
+    r'\b(?:diferencia|brecha|compar\w*|versus|vs)\b',
+)]
+
+# Similitud mínima para aceptar el nombre de una carrera escrito con errores
+UMBRAL_CARRERA = 0.85
+
+# Palabras que pueden seguir al nombre de una carrera sin alargarlo: "Derecho en 2024",
+# "Medicina Humana tiene...". Cualquier otra ("Administración de Empresas") nombra otra carrera
+_CONECTORES = ("de", "del", "en", "y", "e")
+_PALABRAS_PREGUNTA = frozenset(
+    " ".join([f for frases, _, _ in METRICAS.values() for f in frases]).split()
+    + " ".join([f for frases in _TIPOS.values() for f in frases] + list(_MAYOR + _MENOR + _RESUMEN)).split()
+    + list(_NUMEROS)
+    + "a al anual ano cada carrera carreras con cual cuales cuanto cuantos cuanta cuantas el es esta este fue "
+      "fueron hay la las lo los mensual mes para peru por que se segun sobre soles son su sus tiene tienen un "
+      "una".split()
+)
+
+
+def _contiene(texto, frase):
+    return re.search(rf'\b{re.escape(frase)}', texto) is not None
+
+
+def _alarga_nombre(siguientes):
+    # ¿Las palabras que siguen al nombre encontrado continúan el nombre de otra carrera?
+    if siguientes and siguientes[0] in _CONECTORES:
+        siguientes = siguientes[1:]
+    return bool(siguientes) and not siguientes[0].isdigit() and siguientes[0] not in _PALABRAS_PREGUNTA
+
+
+def _soles(valor):
+    return "S/ " + f"{int(valor):,}".replace(",", " ")
+
+
+def _formatear(valor, columna):
+    if pd.isna(valor):
+        return "sin dato"
+    if METRICAS[columna][2]:
+        return _soles(valor)
+    return f"{int(valor):,}".replace(",", " ")
+
+
+class MotorConsultas:
+    """
+    Responde localmente preguntas tabulares sobre las carreras (máximos,
+    mínimos, rankings y valores de una carrera) a partir de vistas
+    indexadas del DataFrame combinado. `responder` devuelve None cuando la
+    pregunta no encaja en esos patrones y debe ir al modelo de lenguaje.
+    """
+
+    def __init__(self, df, dimension=None):
+        self.df = df.reset_index(drop=True)
+        if dimension is not None and 'Id_carrera' in self.df:
+            # Claves ya normalizadas en la tabla de carreras
+            self.nombres = dimension.set_index('Id_carrera')['Clave'].reindex(self.df['Id_carrera']).fillna("").tolist()
+        else:
+            self.nombres = [normalizar_carrera(c) for c in self.df['Carrera']]
+        # Filas de cada nombre distinto: la búsqueda aproximada compara cada nombre una sola vez
+        self._filas = {}
+        for i, nombre in enumerate(self.nombres):
+            self._filas.setdefault(nombre, []).append(i)
+        # Carreras que el MTPE agrupa en otra fila ("Ingeniería de Transportes" está en "Otras
+        # Ingenierías"): se buscan como un nombre más que lleva a las filas de su grupo
+        self._alias = {}
+        tipos = self.df['Tipo'].to_numpy() if 'Tipo' in self.df else None
+        for (tipo, grupo), carreras in ALIAS.items():
+            filas = [i for i in self._filas.get(grupo, []) if tipos is None or tipos[i] == tipo]
+            for carrera in carreras:
+                alias = normalizar_carrera(carrera)
+                if alias not in self._filas:
+                    nombre, anteriores = self._alias.get(alias, (carrera, []))
+                    self._alias[alias] = (nombre, anteriores + filas)
+        self._tokens_nombres = {nombre: nombre.split() for nombre in [*self._filas, *self._alias]}
+        # Índices ordenados por métrica (descendente), globales y por tipo
+        self.orden = {}
+        for columna in METRICAS:
+            valores = self.df[columna].astype('Float64').to_numpy(dtype=float, na_value=np.nan)
+            orden = np.argsort(-np.nan_to_num(valores, nan=-np.inf), kind="stable")
+            orden = orden[~np.isnan(valores[orden])]
+            self.orden[(columna, None)] = orden
+            if 'Tipo' in self.df:
+                tipos = self.df['Tipo'].to_numpy()
+                for tipo in _TIPOS:
+                    self.orden[(columna, tipo)] = orden[tipos[orden] == tipo]
+
+    def _puntaje(self, tokens, texto, nombre):
+        # Devuelve el puntaje y las palabras de la pregunta que siguen al nombre
+        partes = self._tokens_nombres[nombre]
+        if not nombre:
+            return 0.0, []
+        coincidencia = re.search(rf'\b{re.escape(nombre)}', texto)
+        if coincidencia:
+            # Sin la cola de la palabra: "ingenieria" dentro de "ingenierias" termina ahí
+            return 1.0, re.sub(r'^\w*', '', texto[coincidencia.end():]).split()
+        n = len(partes)
+        return max(
+            ((SequenceMatcher(None, " ".join(tokens[j:j + n]), nombre).ratio(), tokens[j + n:])
+             for j in range(max(len(tokens) - n + 1, 1))),
+            default=(0.0, []),
+            key=lambda par: par[0],
+        )
+
+    def _mencion(self, texto):
+        # (alias, filas) de la carrera mencionada, con alias None si se nombró la fila misma;
+        # (None, []) si no hay ninguna y None si hay varias o si la pregunta nombra una carrera
+        # más larga que la encontrada
+        tokens = texto.split()
+        puntajes = {}
+        siguientes = {}
+        for nombre in self._tokens_nombres:
+            puntaje, resto = self._puntaje(tokens, texto, nombre)
+            if puntaje >= UMBRAL_CARRERA:
+                puntajes[nombre] = puntaje
+                siguientes[nombre] = resto
+        # "ingenieria" dentro de "ingenieria civil": quedarse con el nombre más largo
+        puntajes = {
+            nombre: p for nombre, p in puntajes.items()
+            if not any(nombre != otro and nombre in otro for otro in puntajes)
+        }
+        # Solo compiten los nombres con el mejor puntaje (un nombre exacto descarta a los parecidos)
+        mejor = max(puntajes.values(), default=0.0)
+        candidatos = [nombre for nombre, puntaje in puntajes.items() if puntaje == mejor]
+        if len(candidatos) > 1:
+            return None
+        if not candidatos:
+            return None, []
+        nombre = candidatos[0]
+        if _alarga_nombre(siguientes[nombre]):
+            return None
+        if nombre in self._alias:
+            return self._alias[nombre]
+        return None, list(self._filas[nombre])
+
+    def buscar_carreras(self, texto):
+        """
+        Busca en `texto` (normalizado) el nombre de una carrera, exacto o con
+        errores menores, o el de una carrera que el MTPE agrupa en otra fila.
+        Devuelve los índices de las filas con ese nombre (puede haber una
+        universitaria y una técnica), [] si no se menciona ninguna o None si se
+        mencionan varias, si la pregunta nombra una carrera más larga que la
+        encontrada o si su grupo no está en los datos.
+        """
+        mencion = self._mencion(texto)
+        if mencion is None or (mencion[0] is not None and not mencion[1]):
+            return None
+        return mencion[1]
+
+    def _metricas(self, texto):
+        # Columnas mencionadas, en el orden de METRICAS, y el texto sin sus frases
+        columnas = []
+        for columna, (frases, _, _) in METRICAS.items():
+            for frase in frases:
+                if _contiene(texto, frase):
+                    texto = texto.replace(frase, " ")
+                    if columna not in columnas:
+                        columnas.append(columna)
+        return columnas, texto
+
+    def _direccion(self, texto):
+        # Primero las frases de "menor", porque "mas bajo" también contiene "mas"
+        menor = [f for f in _MENOR if _contiene(texto, f)]
+        for frase in menor:
+            texto = texto.replace(frase, " ")
+        mayor = any(_contiene(texto, f) for f in _MAYOR)
+        if mayor == bool(menor):
+            return None
+        return "mayor" if mayor else "menor"
+
+    def _tipo(self, texto):
+        for tipo, frases in _TIPOS.items():
+            if any(_contiene(texto, f) for f in frases):
+                return tipo
+        return None
+
+    def _cantidad(self, texto):
+        coincidencia = re.search(r'\b(?:top|primer[oa]s|las|los|ultim[oa]s)\s+(\d+|' + "|".join(_NUMEROS) + r')\b', texto)
+        if not coincidencia:
+            return None
+        valor = coincidencia.group(1)
+        return int(valor) if valor.isdigit() else _NUMEROS[valor]
+
+    def _describir(self, i, columna, etiquetar=False):
+        fila = self.df.iloc[i]
+        nombre = fila['Carrera']
+        if etiquetar:
+            nombre += f" ({'técnica' if fila['Tipo'] == 'tecnica' else 'universitaria'})"
+        if columna is None:
+            return (
+                f"{nombre}: ingreso promedio {_formatear(fila['Ingreso_promedio'], 'Ingreso_promedio')} "
+                f"(mínimo {_formatear(fila['Ingreso_Minimo'], 'Ingreso_Minimo')}, "
+                f"máximo {_formatear(fila['Ingreso_Maximo'], 'Ingreso_Maximo')}) y "
+                f"{_formatear(fila['Puestos_solicitados_2024'], 'Puestos_solicitados_2024')} puestos solicitados en 2024."
+            )
+        if pd.isna(fila[columna]):
+            return f"No hay dato de {METRICAS[columna][1]} para {nombre}."
+        if columna == 'Puestos_solicitados_2024':
+            return f"En 2024 se solicitaron {_formatear(fila[columna], columna)} puestos para {nombre}."
+        return f"El {METRICAS[columna][1]} de {nombre} es {_formatear(fila[columna], columna)}."
+
+    def responder(self, pregunta):
+        """
+        Devuelve la respuesta en texto o None si la pregunta no es una consulta tabular.
+        """
+        texto = normalizar_pregunta(pregunta)
+        if any(patron.search(texto) for patron in _PARA_EL_MODELO):
+            return None
+        columnas, resto = self._metricas(texto)
+        if len(columnas) > 1:
+            # "¿Qué carrera paga más y tiene más puestos?": una sola métrica no la responde
+            return None
+        columna = columnas[0] if columnas else None
+        tipo = self._tipo(texto)
+        mencion = self._mencion(texto)
+        if mencion is None:
+            return None
+        alias, carreras = mencion
+        if alias is not None and not carreras:
+            # Un alias cuyo grupo no está en estos datos
+            return None
+
+        # Valor de una carrera concreta
+        if carreras and (columna is not None or any(_contiene(texto, f) for f in _RESUMEN)):
+            if tipo is not None and 'Tipo' in self.df:
+                carreras = [i for i in carreras if self.df['Tipo'].iat[i] == tipo] or carreras
+            lineas = [self._describir(i, columna, etiquetar=len(carreras) > 1) for i in carreras]
+            if alias is not None:
+                grupo = re.sub(r'\s*\(\d+\)', '', self.df['Carrera'].iat[carreras[0]]).strip()
+                lineas.insert(0, f"El MTPE incluye {alias} en el grupo «{grupo}».")
+            return "\n".join(lineas)
+
+        if columna is None:
+            return None
+        direccion = self._direccion(resto)
+        if direccion is None:
+            return None
+
+        orden = self.orden.get((columna, tipo), self.orden[(columna, None)])
+        if direccion == "menor":
+            orden = orden[::-1]
+        if len(orden) == 0:
+            return None
+
+        descripcion = METRICAS[columna][1]
+        if columna == 'Puestos_solicitados_2024':
+            direccion = "más" if direccion == "mayor" else "menos"
+        etiqueta_tipo = {"universitaria": "universitaria ", "tecnica": "técnica "}.get(tipo, "")
+        cantidad = self._cantidad(texto)
+        if cantidad and cantidad > 1:
+            filas = self.df.iloc[orden[:cantidad]]
+            lineas = [
+                f"{i}. {fila['Carrera']}: {_formatear(fila[columna], columna)}"
+                for i, (_, fila) in enumerate(filas.iterrows(), start=1)
+            ]
+            encabezado = f"Las {len(lineas)} carreras {etiqueta_tipo.replace('a ', 'as ')}con {direccion} {descripcion}:"
+            return "\n".join([encabezado] + lineas)
+
+        fila = self.df.iloc[orden[0]]
+        return (
+            f"La carrera {etiqueta_tipo}con {direccion} {descripcion} es {fila['Carrera']} "
+            f"({_formatear(fila[columna], columna)})."
+        )
@@ -0,0 +1,123 @@
+# modules/contexto.py
+
+import math
+import os
+from collections import Counter
+
+from modules.limpieza import ALIAS, normalizar_carrera
+
+# Tokens aproximados que se envían como contexto en cada pregunta
+PRESUPUESTO_TOKENS = int(os.environ.get("CARRERAS_PRESUPUESTO_CONTEXTO", 600))
+
+# Palabras que no ayudan a distinguir carreras
+_VACIAS = frozenset(
+    "a al con cual cuales cuanto cuantos cuanta cuantas de del el en es esta este hay la las lo los mas me "
+    "mi o para por que se sobre son su tiene tienen un una y carrera carreras ingreso ingresos puestos "
+    "promedio minimo maximo 2024 solicitados solicitaron".split()
+)
+
+
+def _tokens(texto):
+    palabras = normalizar_carrera(texto).split()
+    # Singular aproximado: "ingenierias" y "ingenieria" cuentan como la misma palabra
+    return [p[:-1] if len(p) > 4 and p.endswith("s") else p for p in palabras if p not in _VACIAS]
+
+
+def estimar_tokens(texto):
+    """
+    Estimación rápida de tokens (unos 4 caracteres por token).
+    """
+    return math.ceil(len(texto) / 4)
+
+
+def _soles(serie):
+    return "S/ " + serie.astype('string').fillna("s/d")
+
+
+def lineas_carreras(df):
+    """
+    Una línea de texto por carrera con todos sus datos, construida de forma vectorizada.
+    """
+    tipo = df['Tipo'].map({"universitaria": "universitaria", "tecnica": "técnica"}) if 'Tipo' in df else None
+    nombre = df['Carrera'] if tipo is None else df['Carrera'] + " (" + tipo + ")"
+    return (
+        "- " + nombre
+        + ": ingreso promedio " + _soles(df['Ingreso_promedio'])
+        + " (mínimo " + _soles(df['Ingreso_Minimo'])
+        + ", máximo " + _soles(df['Ingreso_Maximo'])
+        + "); " + df['Puestos_solicitados_2024'].astype('string').fillna("s/d")
+        + " puestos solicitados en 2024"
+    )
+
+
+def construir_contexto(df):
+    """
+    Contexto completo con todas las carreras (se usa como huella de los datos).
+    """
+    return "Datos de Carreras en Perú:\n\n" + "\n".join(lineas_carreras(df).tolist()) + "\n"
+
+
+class IndiceContexto:
+    """
+    Índice TF-IDF local sobre los nombres de carrera, su tipo y sus alias.
+    Para cada pregunta elige solo las filas relevantes hasta llenar un
+    presupuesto de tokens, en lugar de enviar la tabla completa.
+    """
+
+    def __init__(self, df, dimension=None):
+        self.df = df.reset_index(drop=True)
+        self.lineas = lineas_carreras(self.df).tolist()
+        self.costos = [estimar_tokens(linea) + 1 for linea in self.lineas]
+
+        # Con la tabla de carreras, los alias se toman por Id_carrera sin volver a normalizar nombres
+        alias_por_id = None
+        if dimension is not None and 'Id_carrera' in self.df:
+            alias_por_id = dimension.set_index('Id_carrera')['Alias'].reindex(self.df['Id_carrera']).fillna("").tolist()
+
+        documentos = []
+        for i, fila in self.df.iterrows():
+            tipo = fila.get('Tipo')
+            if alias_por_id is not None:
+                alias = [a for a in alias_por_id[i].split("; ") if a]
+            else:
+                alias = ALIAS.get((tipo, normalizar_carrera(fila['Carrera'])), ())
+            documentos.append(Counter(_tokens(" ".join([fila['Carrera'], str(tipo or ""), *alias]))))
+
+        frecuencia = Counter(t for doc in documentos for t in doc)
+        n = len(documentos)
+        self.idf = {t: math.log((1 + n) / (1 + f)) + 1 for t, f in frecuencia.items()}
+        self.vectores = []
+        for doc in documentos:
+            vector = {t: c * self.idf[t] for t, c in doc.items()}
+            norma = math.sqrt(sum(v * v for v in vector.values())) or 1.0
+            self.vectores.append({t: v / norma for t, v in vector.items()})
+        # Respaldo para preguntas generales: carreras de mayor ingreso y de mayor demanda, intercaladas
+        por_ingreso = self.df['Ingreso_promedio'].astype('Float64').fillna(-1).sort_values(ascending=False).index
+        por_demanda = self.df['Puestos_solicitados_2024'].astype('Float64').fillna(-1).sort_values(ascending=False).index
+        self.generales = list(dict.fromkeys(i for par in zip(por_ingreso, por_demanda) for i in par))
+
+    def puntajes(self, pregunta):
+        consulta = Counter(t for t in _tokens(pregunta) if t in self.idf)
+        if not consulta:
+            return []
+        return [
+            (sum(peso * self.idf[t] * vector.get(t, 0.0) for t, peso in consulta.items()), i)
+            for i, vector in enumerate(self.vectores)
+        ]
+
+    def seleccionar(self, pregunta, presupuesto=PRESUPUESTO_TOKENS):
+        """
+        Contexto con las filas más relevantes para `pregunta` sin pasar de `presupuesto` tokens.
+        Si la pregunta no menciona ninguna carrera, se usan las de mayor ingreso y demanda.
+        """
+        relevantes = [i for puntaje, i in sorted(self.puntajes(pregunta), reverse=True) if puntaje > 0]
+        encabezado = "Datos de Carreras en Perú (selección relevante para la pregunta):\n\n"
+        usados = estimar_tokens(encabezado)
+        elegidas = []
+        ya_relevantes = set(relevantes)
+        for i in relevantes + [i for i in self.generales if i not in ya_relevantes]:
+            if usados + self.costos[i] > presupuesto:
+                break
+            elegidas.append(i)
+            usados += self.costos[i]
+        return encabezado + "\n".join(self.lineas[i] for i in elegidas) + "\n"
@@ -0,0 +1,150 @@
+# modules/coordinador_llm.py
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from modules import metricas
+
+# Llamadas simultáneas al modelo por proceso y peticiones que pueden esperar turno
+MAX_CONCURRENTES = int(os.environ.get("CARRERAS_LLM_CONCURRENCIA", 4))
+MAX_EN_COLA = int(os.environ.get("CARRERAS_LLM_COLA", 16))
+# Segundos que un lector espera el siguiente fragmento (incluye el tiempo en cola)
+ESPERA_MAXIMA = float(os.environ.get("CARRERAS_LLM_ESPERA", 120))
+
+
+class ServicioSaturado(RuntimeError):
+    """
+    No hay capacidad para atender la pregunta ahora (cola llena o espera agotada).
+    """
+
+
+class _Vuelo:
+    # Una llamada en curso: los fragmentos recibidos se guardan para que
+    # cualquier sesión que se sume tarde los lea desde el principio
+    def __init__(self):
+        self.fragmentos = []
+        self.terminado = False
+        self.error = None
+        self.condicion = threading.Condition()
+
+    def publicar(self, fragmento):
+        with self.condicion:
+            self.fragmentos.append(fragmento)
+            self.condicion.notify_all()
+
+    def terminar(self, error=None):
+        with self.condicion:
+            self.terminado = True
+            self.error = error
+            self.condicion.notify_all()
+
+    def leer(self, espera):
+        leidos = 0
+        while True:
+            with self.condicion:
+                if not self.condicion.wait_for(lambda: self.terminado or len(self.fragmentos) > leidos, espera):
+                    raise ServicioSaturado("Tiempo de espera agotado al consultar el modelo")
+                nuevos = self.fragmentos[leidos:]
+                terminado, error = self.terminado, self.error
+            leidos += len(nuevos)
+            yield from nuevos
+            if terminado:
+                if error is not None:
+                    raise error
+                return
+
+
+class CoordinadorLLM:
+    """
+    Coordina las llamadas al modelo de todo el proceso:
+
+    - Preguntas idénticas en curso comparten una sola llamada (single-flight):
+      la primera la inicia y las demás leen los mismos fragmentos.
+    - Un pool de `max_concurrentes` hilos limita las llamadas simultáneas;
+      hasta `max_en_cola` más esperan turno y el resto se rechaza de inmediato
+      con ServicioSaturado, sin llegar a RapidAPI.
+
+    La llamada corre en el pool y no en la sesión que la inició, de modo que
+    si esa sesión se cierra las demás siguen recibiendo la respuesta.
+    """
+
+    def __init__(self, max_concurrentes=MAX_CONCURRENTES, max_en_cola=MAX_EN_COLA, espera=ESPERA_MAXIMA):
+        self.max_concurrentes = max_concurrentes
+        self.max_en_cola = max_en_cola
+        self.espera = espera
+        self._pool = ThreadPoolExecutor(max_workers=max_concurrentes, thread_name_prefix="llm")
+        self._lock = threading.Lock()
+        self._vuelos = {}
+        self._activos = 0
+        self.contadores = {"llamadas": 0, "compartidas": 0, "rechazadas": 0}
+
+    def transmitir(self, clave, fabrica):
+        """
+        Genera los fragmentos de la respuesta para `clave`. Si no hay una llamada
+        en curso con esa clave, la inicia con `fabrica()` (que debe devolver un
+        iterable de fragmentos); si la hay, se suma a ella. Los errores de la
+        llamada se relanzan en cada lector.
+        """
+        with self._lock:
+            vuelo = self._vuelos.get(clave)
+            if vuelo is not None:
+                resultado = "compartidas"
+            elif self._activos >= self.max_concurrentes + self.max_en_cola:
+                resultado = "rechazadas"
+            else:
+                resultado = "llamadas"
+                vuelo = _Vuelo()
+                self._vuelos[clave] = vuelo
+                self._activos += 1
+                self._pool.submit(self._volar, clave, vuelo, fabrica)
+            self.contadores[resultado] += 1
+        metricas.contar("llm", resultado=resultado)
+        if vuelo is None:
+            raise ServicioSaturado("Hay demasiadas consultas en curso")
+        return vuelo.leer(self.espera)
+
+    def ejecutar(self, clave, funcion):
+        """
+        Como `transmitir`, para llamadas que devuelven la respuesta completa.
+        """
+        return "".join(self.transmitir(clave, lambda: (funcion(),)))
+
+    def _volar(self, clave, vuelo, fabrica):
+        try:
+            for fragmento in fabrica():
+                vuelo.publicar(fragmento)
+        except Exception as e:
+            vuelo.terminar(e)
+        else:
+            vuelo.terminar()
+        finally:
+            with self._lock:
+                if self._vuelos.get(clave) is vuelo:
+                    del self._vuelos[clave]
+                self._activos -= 1
+
+    def estadisticas(self):
+        """
+        Contadores de llamadas, preguntas compartidas y rechazos, y carga actual.
+        """
+        with self._lock:
+            estadisticas = dict(self.contadores)
+            estadisticas["en_curso"] = self._activos
+        return estadisticas
+
+
+_coordinador = None
+_coordinador_lock = threading.Lock()
+
+
+def obtener_coordinador():
+    """
+    Devuelve el coordinador compartido por todas las sesiones del proceso.
+    """
+    global _coordinador
+    if _coordinador is None:
+        with _coordinador_lock:
+            if _coordinador is None:
+                _coordinador = CoordinadorLLM()
+    return _coordinador
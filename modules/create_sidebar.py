@@ -1,10 +1,57 @@
 # modules/create_sidebar.py
 
+import importlib
+import json
+import os
+
 import streamlit as st
 from streamlit_option_menu import option_menu
-from paginas import universitaria, tecnica, preguntas
+
+from modules import metricas, precalentamiento
+
+# Páginas del menú: opción -> (módulo, ícono). Cada módulo se importa solo cuando
+# se selecciona, para no cargar pandas/plotly/requests antes de la primera pintura.
+PAGINAS = {
+    "Universitaria": ("paginas.universitaria", "mortarboard"),
+    "Técnica": ("paginas.tecnica", "tools"),
+    "Preguntas": ("paginas.preguntas", "chat-left-dots-fill"),
+}
+
+def depuracion_activa():
+    """
+    El panel de depuración es opcional: se activa con ?depuracion=1 o CARRERAS_DEPURACION=1.
+    """
+    return os.environ.get("CARRERAS_DEPURACION") == "1" or st.query_params.get("depuracion") == "1"
+
+
+def mostrar_panel_depuracion(rerun, precalentado):
+    # Tramos del rerun que acaba de terminar, contadores de caché del proceso y estado del precalentamiento
+    with st.sidebar.expander("Depuración", expanded=True):
+        st.caption(f"Rerun: {rerun['total_ms']:.0f} ms ({rerun['pagina']})")
+        if precalentado["error"]:
+            st.caption(f"Precalentamiento fallido: {precalentado['error']}")
+        else:
+            etapas = ", ".join(f"{etapa} {ms:.0f} ms" for etapa, ms in precalentado["etapas"].items())
+            st.caption(f"Precalentamiento {'listo' if precalentado['listo'] else 'en curso'}: {etapas or '-'}")
+        st.text("\n".join(f"{'  ' * t['nivel']}{t['nombre']}: {t['ms']:.1f} ms" for t in rerun["tramos"]))
+        for capa, valores in sorted(metricas.resumen_caches().items()):
+            st.caption(f"Caché {capa}: {valores['acierto']} aciertos, {valores['fallo']} fallos "
+                       f"({valores['tasa_aciertos']:.0%})")
+        # Se importa aquí para no cargar los datos en el arranque (igual que las páginas)
+        from modules.datos import cargar_cobertura
+        st.caption("Cobertura de la unión ingresos-demanda")
+        st.dataframe(cargar_cobertura(), hide_index=True)
+        st.download_button("Rerun (JSON)", json.dumps(rerun, ensure_ascii=False, indent=2),
+                           file_name="rerun.json", mime="application/json")
+        st.download_button("Métricas (Prometheus)", metricas.exportar_prometheus(),
+                           file_name="metricas.prom", mime="text/plain")
+
 
 def create_sidebar():
+    rerun = metricas.iniciar_rerun()
+    # El primer rerun del proceso lanza el precalentamiento en segundo plano; no se espera
+    estado = precalentamiento.iniciar()
+
     # Añadir texto personalizado en el sidebar con markdown y HTML
     st.sidebar.markdown(
         f'''
@@ -23,20 +70,22 @@ def create_sidebar():
     )
 
     # Crear el menú de opciones en el sidebar con option_menu
-    with st.sidebar:
+    with st.sidebar, metricas.tramo("sidebar"):
         selected = option_menu(
             menu_title="Menú",  # Título del menú
-            options=["Universitaria", "Técnica", "Preguntas"],  # Opciones del menú
-            icons=["mortarboard", "tools", "chat-left-dots-fill"],  # Íconos correspondientes
+            options=list(PAGINAS),  # Opciones del menú
+            icons=[icono for _, icono in PAGINAS.values()],  # Íconos correspondientes
             menu_icon="cast",  # Ícono del menú principal
             default_index=0,  # Índice por defecto
             orientation="vertical"  # Orientación del menú
         )
 
-    # Llama a la función de la página correspondiente en función de la selección
-    if selected == "Universitaria":
-        universitaria.display()
-    elif selected == "Técnica":
-        tecnica.display()
-    elif selected == "Preguntas":
-        preguntas.display()
+    # Importa solo la página seleccionada y llama a su función display()
+    if selected in PAGINAS:
+        modulo, _ = PAGINAS[selected]
+        with metricas.tramo(f"pagina:{selected}"):
+            importlib.import_module(modulo).display()
+
+    metricas.terminar_rerun(selected)
+    if depuracion_activa():
+        mostrar_panel_depuracion(rerun, estado)
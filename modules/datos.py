@@ -0,0 +1,91 @@
+# modules/datos.py
+
+import streamlit as st
+
+from modules import almacen, metricas
+from modules.fuentes import REGION_NACIONAL, refrescar_tablas
+
+
+@metricas.con_contadores(
+    "manifiesto", st.cache_data(ttl=almacen.INTERVALO_REVISION, show_spinner="Cargando datos del MTPE...")
+)
+def manifiesto_datos():
+    """
+    Manifiesto del almacén compartido; solo un proceso refresca las tablas cuando vencen.
+    """
+    return almacen.asegurar(refrescar_tablas)
+
+
+# Un solo DataFrame por tabla y proceso, compartido por todas las sesiones sin copiarlo
+# (st.cache_data devolvería una copia en cada lectura). No se debe modificar en el lugar.
+@metricas.con_contadores("tablas", st.cache_resource(show_spinner=False, max_entries=16))
+def _tabla(archivo):
+    return almacen.leer({"archivo": archivo})
+
+
+# Índice por región: cada región es un rango contiguo de filas de la tabla regional,
+# así que cambiar de región es una búsqueda en un dict, sin releer ni recombinar
+@metricas.con_contadores("regiones", st.cache_resource(show_spinner=False, max_entries=4))
+def _indice_regional(archivo):
+    df = _tabla(archivo)
+    posiciones = df.groupby('Region', sort=False).indices
+    return {
+        region: df.iloc[filas[0]:filas[-1] + 1].drop(columns='Region').reset_index(drop=True)
+        for region, filas in sorted(posiciones.items(), key=lambda par: par[1][0])
+    }
+
+
+def regiones_disponibles(tipo):
+    """
+    Regiones con datos para `tipo` (la primera es 'Nacional'); [] si no hay libros regionales.
+    """
+    entrada = manifiesto_datos()["tablas"].get(f"regional_{tipo}")
+    return list(_indice_regional(entrada["archivo"])) if entrada else []
+
+
+def cargar_carreras(tipo, region=None):
+    """
+    Devuelve el DataFrame combinado de ingresos y demanda para 'universitaria' o 'tecnica',
+    nacional o de una región.
+    """
+    if region in (None, REGION_NACIONAL):
+        return _tabla(manifiesto_datos()["tablas"][tipo]["archivo"])
+    return _indice_regional(manifiesto_datos()["tablas"][f"regional_{tipo}"]["archivo"])[region]
+
+
+def cargar_combinado():
+    """
+    Devuelve las carreras universitarias y técnicas en un solo DataFrame,
+    con la columna 'Tipo' ('universitaria' o 'tecnica').
+    """
+    return _tabla(manifiesto_datos()["tablas"]["combinado"]["archivo"])
+
+
+def cargar_dimension():
+    """
+    Tabla de carreras canónica (Id_carrera, Tipo, Clave, Carrera, Alias, Codigo_INEI)
+    de la misma versión de los datos que las demás tablas.
+    """
+    return _tabla(manifiesto_datos()["tablas"]["dimension"]["archivo"])
+
+
+def cargar_cobertura():
+    """
+    Cobertura de la unión de ingresos y demanda para cada región y tipo de carrera.
+    """
+    return _tabla(manifiesto_datos()["tablas"]["cobertura"]["archivo"])
+
+
+def version_carreras(tipo, region=None):
+    """
+    Versión de los datos de un tipo de carrera, usada como clave de los cachés derivados.
+    """
+    tabla = tipo if region in (None, REGION_NACIONAL) else f"regional_{tipo}"
+    return manifiesto_datos()["tablas"][tabla]["version"]
+
+
+def version_combinado():
+    """
+    Versión de los datos combinados (universitarias y técnicas).
+    """
+    return manifiesto_datos()["tablas"]["combinado"]["version"]
@@ -0,0 +1,100 @@
+# modules/dimension_carreras.py
+
+import functools
+import os
+
+import numpy as np
+import pandas as pd
+
+from modules.limpieza import ALIAS, normalizar_carrera
+
+# Códigos INEI de 3 dígitos (campo detallado del clasificador de carreras) en un CSV opcional
+# con columnas Carrera,Codigo; el MTPE no los publica en sus cuadros, así que sin este archivo quedan vacíos
+ARCHIVO_CODIGOS_INEI = os.environ.get("CARRERAS_CODIGOS_INEI")
+
+COLUMNAS_DIMENSION = ['Id_carrera', 'Tipo', 'Clave', 'Carrera', 'Alias', 'Codigo_INEI']
+
+# Los mismos nombres aparecen en varias fuentes y regiones: cada uno se normaliza una vez por proceso
+_normalizar = functools.lru_cache(maxsize=65536)(normalizar_carrera)
+
+
+def claves(carreras):
+    """
+    Clave normalizada de cada nombre de una Serie.
+    """
+    codigos, unicos = pd.factorize(carreras)
+    normalizadas = np.array([_normalizar(nombre) for nombre in np.asarray(unicos, dtype=object)] + [""], dtype=object)
+    # factorize marca los nulos con -1: se toman como la clave vacía (el último elemento)
+    return pd.Series(normalizadas[codigos], index=carreras.index, dtype=object)
+
+
+def codigos_inei():
+    """
+    {clave de carrera: código INEI} del archivo CARRERAS_CODIGOS_INEI, o {} si no está configurado.
+    """
+    if not ARCHIVO_CODIGOS_INEI:
+        return {}
+    codigos = pd.read_csv(ARCHIVO_CODIGOS_INEI, dtype=str)
+    return dict(zip(claves(codigos['Carrera']), codigos['Codigo'].str.zfill(3)))
+
+
+def construir_dimension(fuentes):
+    """
+    Tabla de carreras canónica a partir de `fuentes` (pares (tipo, DataFrame con 'Carrera')):
+    una fila por carrera distinta de cada tipo, con un Id_carrera entero, su clave
+    normalizada, el primer nombre visto, sus alias del MTPE y su código INEI.
+    """
+    todas = pd.concat(
+        [pd.DataFrame({'Tipo': tipo, 'Carrera': df['Carrera'].astype(str)}) for tipo, df in fuentes],
+        ignore_index=True,
+    )
+    todas['Clave'] = claves(todas['Carrera'])
+    dimension = todas[todas['Clave'] != ""].drop_duplicates(['Tipo', 'Clave'], ignore_index=True)
+    dimension.insert(0, 'Id_carrera', np.arange(len(dimension), dtype='int32'))
+    dimension['Alias'] = ["; ".join(ALIAS.get(par, ())) for par in zip(dimension['Tipo'], dimension['Clave'])]
+    dimension['Codigo_INEI'] = dimension['Clave'].map(codigos_inei()).astype('string')
+    return dimension[COLUMNAS_DIMENSION]
+
+
+def asignar_ids(df, dimension, tipo):
+    """
+    Copia de `df` con la columna 'Id_carrera' de cada carrera de `tipo` (<NA> si no está en la dimensión).
+    """
+    del_tipo = dimension[dimension['Tipo'] == tipo]
+    posiciones = pd.Index(del_tipo['Clave']).get_indexer(claves(df['Carrera']))
+    # Las carreras sin pareja (-1) toman el último elemento, un <NA> agregado al final
+    ids = pd.array([*del_tipo['Id_carrera'], pd.NA], dtype='Int32')[posiciones]
+    return df.assign(Id_carrera=ids)
+
+
+def unir(ingresos_df, demanda_df, dimension, tipo):
+    """
+    Une ingresos y demanda por Id_carrera (un join de enteros). Si una clave se
+    repite en una fuente, se conserva su primera fila.
+    """
+    ingresos = asignar_ids(ingresos_df, dimension, tipo).dropna(subset=['Id_carrera'])
+    demanda = asignar_ids(demanda_df, dimension, tipo).dropna(subset=['Id_carrera'])
+    return pd.merge(
+        ingresos.drop_duplicates('Id_carrera'),
+        demanda.drop_duplicates('Id_carrera').drop(columns='Carrera'),
+        on='Id_carrera',
+        how='inner',
+    )
+
+
+def cobertura(ingresos_df, demanda_df, unidas, **etiquetas):
+    """
+    Estadísticas de la unión: carreras distintas de cada fuente, cuántas se unieron,
+    cuántas se habrían unido comparando el texto exacto y cuántas quedaron sin pareja.
+    """
+    en_ingresos = claves(ingresos_df['Carrera']).nunique()
+    en_demanda = claves(demanda_df['Carrera']).nunique()
+    return {
+        **etiquetas,
+        'Ingresos': en_ingresos,
+        'Demanda': en_demanda,
+        'Unidas': len(unidas),
+        'Unidas_texto_exacto': int(ingresos_df['Carrera'].drop_duplicates().isin(demanda_df['Carrera']).sum()),
+        'Solo_ingresos': en_ingresos - len(unidas),
+        'Solo_demanda': en_demanda - len(unidas),
+    }
@@ -0,0 +1,239 @@
+# modules/fuentes.py
+#
+# Descarga, limpieza y combinación de los libros del MTPE, sin Streamlit: lo usan la app
+# (a través de modules/datos.py), la API y los scripts de exportación.
+
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from modules import metricas
+from modules.cache_datos import cargar_snapshot
+from modules.dimension_carreras import cobertura, construir_dimension, unir
+from modules.lector_excel import leer_tabla
+from modules.limpieza import extraer_rango, limpiar_moneda
+
+logger = logging.getLogger(__name__)
+
+# Fuentes publicadas por el MTPE (ingresos: C:E, demanda: C:D); los límites de cada
+# tabla se detectan al leerla, por lo que no dependen del número de filas de la edición
+FUENTES = {
+    "ingresos_universitaria": {
+        "url": "https://cdn.www.gob.pe/uploads/document/file/5901478/5207826-universitarias_mp_nacional.xlsx",
+        "tabla": "ingresos",
+        "usecols": "C:E",
+    },
+    "demanda_universitaria": {
+        "url": "https://cdn.www.gob.pe/uploads/document/file/5988129/5306104-md_universitarias_nacional.xlsx",
+        "tabla": "demanda",
+        "usecols": "C:D",
+    },
+    "ingresos_tecnica": {
+        "url": "https://cdn.www.gob.pe/uploads/document/file/5901305/5207826-tecnicas_mp_nacional.xlsx",
+        "tabla": "ingresos",
+        "usecols": "C:E",
+    },
+    "demanda_tecnica": {
+        "url": "https://cdn.www.gob.pe/uploads/document/file/5988189/5306104-md_tecnicas_nacional.xlsx",
+        "tabla": "demanda",
+        "usecols": "C:D",
+    },
+}
+
+# Plantilla opcional para descargar las fuentes de otro origen, por ejemplo el CDN
+# local de benchmarks/: CARRERAS_URL_FUENTES="http://127.0.0.1:8800/{nombre}_x1.xlsx"
+URL_FUENTES = os.environ.get("CARRERAS_URL_FUENTES")
+
+# Libros regionales (mismo diseño que los nacionales) en un JSON opcional:
+# {"Arequipa": {"ingresos_universitaria": "https://...", "demanda_universitaria": "https://...", ...}, ...}
+ARCHIVO_REGIONES = os.environ.get("CARRERAS_REGIONES")
+REGION_NACIONAL = "Nacional"
+
+# Descargas simultáneas al cargar todas las fuentes (nacionales y regionales)
+MAX_DESCARGAS = int(os.environ.get("CARRERAS_MAX_DESCARGAS", 8))
+
+# Fuentes de ingresos y demanda que se combinan para cada tipo de carrera
+TIPOS = {
+    "universitaria": ("ingresos_universitaria", "demanda_universitaria"),
+    "tecnica": ("ingresos_tecnica", "demanda_tecnica"),
+}
+
+COLUMNAS = ['Carrera', 'Ingreso_promedio', 'Ingreso_Minimo', 'Ingreso_Maximo', 'Puestos_solicitados_2024', 'Id_carrera']
+
+
+def limpiar_ingresos(df):
+    """
+    Convierte las columnas de ingresos leídas del Excel a enteros.
+    """
+    # Limpiar 'Ingreso_promedio': eliminar 'S/' y espacios, convertir a entero
+    df['Ingreso_promedio'] = limpiar_moneda(df['Ingreso_promedio'])
+
+    df[['Ingreso_Minimo', 'Ingreso_Maximo']] = extraer_rango(df['Minimo_Maximo'])
+    df.drop('Minimo_Maximo', axis=1, inplace=True)
+
+    return df
+
+
+def parse_ingresos(contenido, fuente):
+    """
+    Procesa los datos de ingresos desde el contenido del archivo Excel.
+    """
+    return limpiar_ingresos(leer_tabla(contenido, fuente["usecols"], ['Carrera', 'Ingreso_promedio', 'Minimo_Maximo']))
+
+
+def limpiar_demanda(df):
+    """
+    Convierte la columna de puestos solicitados leída del Excel a enteros.
+    """
+    # Limpiar 'Puestos_solicitados_2024': eliminar posibles caracteres no numéricos
+    df['Puestos_solicitados_2024'] = limpiar_moneda(df['Puestos_solicitados_2024'])
+
+    return df
+
+
+def parse_demanda(contenido, fuente):
+    """
+    Procesa los datos de demanda de puestos desde el contenido del archivo Excel.
+    """
+    return limpiar_demanda(leer_tabla(contenido, fuente["usecols"], ['Carrera', 'Puestos_solicitados_2024']))
+
+
+PARSERS = {
+    "ingresos": parse_ingresos,
+    "demanda": parse_demanda,
+}
+
+
+def url_fuente(nombre):
+    """
+    URL de descarga de una fuente (la de FUENTES, salvo que se defina CARRERAS_URL_FUENTES).
+    """
+    return URL_FUENTES.format(nombre=nombre) if URL_FUENTES else FUENTES[nombre]["url"]
+
+
+def regiones():
+    """
+    Libros regionales declarados en CARRERAS_REGIONES: {región: {nombre de fuente: url}}.
+    Una región sin URL para alguna de las fuentes de FUENTES se omite con un aviso.
+    """
+    if not ARCHIVO_REGIONES:
+        return {}
+    with open(ARCHIVO_REGIONES, encoding="utf-8") as f:
+        declaradas = json.load(f)
+    config = {}
+    for region, urls in declaradas.items():
+        if region == REGION_NACIONAL:
+            continue
+        faltan = [nombre for nombre in FUENTES if not isinstance(urls, dict) or not urls.get(nombre)]
+        if faltan:
+            logger.warning("Región %s omitida: %s no declara %s", region, ARCHIVO_REGIONES, ", ".join(faltan))
+            continue
+        config[region] = {nombre: urls[nombre] for nombre in FUENTES}
+    return config
+
+
+def cargar_fuente(nombre, url=None):
+    """
+    Descarga (o lee del snapshot) y procesa una de las fuentes declaradas en FUENTES;
+    `url` permite leer el libro equivalente de otra región.
+    """
+    fuente = FUENTES[nombre]
+    parser = PARSERS[fuente["tabla"]]
+    return cargar_snapshot(url or url_fuente(nombre), lambda contenido: parser(contenido, fuente), fuente["tabla"])
+
+
+def cargar_fuentes(regionales=None):
+    """
+    Carga todas las fuentes en paralelo; el tiempo total es el de la descarga más lenta.
+    Con `regionales` ({región: {nombre: url}}) carga también esos libros en el mismo
+    pool y devuelve {(región, nombre): DataFrame} en lugar de {nombre: DataFrame}.
+    Si un libro regional no se puede descargar o leer, su región queda fuera del
+    resultado (con un aviso); un error en una fuente nacional sí se propaga.
+    """
+    tareas = {(REGION_NACIONAL, nombre): None for nombre in FUENTES}
+    for region, urls in (regionales or {}).items():
+        tareas.update({(region, nombre): url for nombre, url in urls.items()})
+    with ThreadPoolExecutor(max_workers=min(len(tareas), MAX_DESCARGAS)) as executor:
+        futuros = {
+            clave: executor.submit(metricas.en_contexto(cargar_fuente), clave[1], url)
+            for clave, url in tareas.items()
+        }
+        resultados = {}
+        fallidas = set()
+        for (region, nombre), futuro in futuros.items():
+            try:
+                resultados[(region, nombre)] = futuro.result()
+            except Exception as e:
+                if region == REGION_NACIONAL:
+                    raise
+                logger.warning("Región %s omitida: no se pudo cargar %s (%s)", region, nombre, e)
+                fallidas.add(region)
+    resultados = {clave: df for clave, df in resultados.items() if clave[0] not in fallidas}
+    if regionales is None:
+        return {nombre: df for (_, nombre), df in resultados.items()}
+    return resultados
+
+
+def combinar(ingresos_df, demanda_df, dimension=None, tipo=""):
+    """
+    Une ingresos y demanda por el Id_carrera de la tabla de carreras `dimension`
+    (si no se pasa, se arma solo con estas dos fuentes) y fija los tipos de cada columna.
+    """
+    if dimension is None:
+        dimension = construir_dimension([(tipo, ingresos_df), (tipo, demanda_df)])
+    merged_df = unir(ingresos_df, demanda_df, dimension, tipo)
+    return merged_df[COLUMNAS].astype({
+        'Carrera': str,
+        'Ingreso_promedio': 'Int64',
+        'Ingreso_Minimo': 'Int64',
+        'Ingreso_Maximo': 'Int64',
+        'Puestos_solicitados_2024': 'Int64',
+        'Id_carrera': 'int32',
+    })
+
+
+def refrescar_tablas():
+    """
+    Descarga y procesa todas las fuentes y arma las tablas que se publican en el almacén:
+    una por tipo de carrera y la combinada, con la columna 'Tipo'. Si hay libros
+    regionales, también una tabla 'regional_<tipo>' con las regiones que se pudieron
+    cargar, agrupada por la columna 'Region'; las tablas nacionales no dependen de
+    ellas. Además, la tabla de carreras ('dimension') con la que se
+    unen todas las fuentes y la cobertura de cada unión ('cobertura').
+    """
+    config = regiones()
+    fuentes = cargar_fuentes(config)
+    todas = [REGION_NACIONAL, *(region for region in config if all((region, nombre) in fuentes for nombre in FUENTES))]
+    with metricas.tramo("dimension"):
+        dimension = construir_dimension(
+            (tipo, fuentes[(region, nombre)]) for region in todas for tipo, nombres in TIPOS.items() for nombre in nombres
+        )
+    with metricas.tramo("combinacion"):
+        por_region = {}
+        coberturas = []
+        for region in todas:
+            for tipo, (ingresos, demanda) in TIPOS.items():
+                unidas = combinar(fuentes[(region, ingresos)], fuentes[(region, demanda)], dimension, tipo)
+                por_region[(region, tipo)] = unidas
+                coberturas.append(cobertura(
+                    fuentes[(region, ingresos)], fuentes[(region, demanda)], unidas, Region=region, Tipo=tipo
+                ))
+        tablas = {tipo: por_region[(REGION_NACIONAL, tipo)] for tipo in TIPOS}
+        tablas["combinado"] = pd.concat(
+            [df.assign(Tipo=tipo) for tipo, df in tablas.items()],
+            ignore_index=True,
+        )
+        if len(todas) > 1:
+            for tipo in TIPOS:
+                tablas[f"regional_{tipo}"] = pd.concat(
+                    [por_region[(region, tipo)].assign(Region=region) for region in todas],
+                    ignore_index=True,
+                )
+    tablas["dimension"] = dimension
+    tablas["cobertura"] = pd.DataFrame(coberturas)
+    for fila in coberturas:
+        logger.info("Cobertura de la unión: %s", fila)
+    return tablas
@@ -0,0 +1,223 @@
+# modules/graficos.py
+
+import plotly.express as px
+import plotly.io as pio
+import requests
+import streamlit as st
+
+from modules import almacen, historico, metricas
+from modules.datos import cargar_carreras, regiones_disponibles, version_carreras
+from modules.tendencia import MODOS, ajustar_tendencia, agregar_tendencia
+
+
+def vistas_derivadas(merged_df):
+    """
+    Calcula las vistas ordenadas que usan los gráficos a partir del DataFrame combinado.
+    """
+    return {
+        "combinado": merged_df,
+        # Ordenado por ingreso promedio descendente para el gráfico de ingresos
+        "ingresos": merged_df.sort_values(by='Ingreso_promedio', ascending=False),
+        # Ordenado por puestos solicitados ascendentes para el gráfico de puestos solicitados
+        "demanda": merged_df.sort_values(by='Puestos_solicitados_2024', ascending=True),
+        "top10": merged_df.nlargest(10, 'Puestos_solicitados_2024'),
+        # Solo carreras con ambos datos: el tamaño de los puntos no admite valores faltantes
+        "relacion": merged_df.dropna(subset=['Ingreso_promedio', 'Puestos_solicitados_2024']),
+    }
+
+
+def figura_ingresos(vistas, modo_tendencia=None):
+    # Gráfico 1: Ingreso Promedio por Carrera
+    return px.bar(
+        vistas["ingresos"],
+        x='Ingreso_promedio',
+        y='Carrera',
+        orientation='h',
+        title='Ingreso Promedio Mensual por Carrera',
+        labels={'Ingreso_promedio': 'Ingreso Promedio (S/)', 'Carrera': 'Carrera'},
+        hover_data={'Ingreso_promedio': ':.2f', 'Ingreso_Minimo': True, 'Ingreso_Maximo': True},
+        template='plotly_white'
+    )
+
+
+def figura_demanda(vistas, modo_tendencia=None):
+    # Gráfico 2: Puestos Solicitados por Carrera en 2024 (Ordenado de Menor a Mayor)
+    return px.bar(
+        vistas["demanda"],
+        x='Puestos_solicitados_2024',
+        y='Carrera',
+        orientation='h',
+        title='Puestos Solicitados en 2024 por Carrera',
+        labels={'Puestos_solicitados_2024': 'Puestos Solicitados', 'Carrera': 'Carrera'},
+        hover_data={'Puestos_solicitados_2024': True},
+        template='plotly_white'
+    )
+
+
+def figura_relacion(vistas, modo_tendencia="ols"):
+    # Gráfico 3: Relación entre Ingreso Promedio y Puestos Solicitados
+    merged_df = vistas["relacion"]
+    fig = px.scatter(
+        merged_df,
+        x='Ingreso_promedio',
+        y='Puestos_solicitados_2024',
+        hover_name='Carrera',
+        size='Puestos_solicitados_2024',
+        title='Ingreso Promedio vs Puestos Solicitados',
+        labels={'Ingreso_promedio': 'Ingreso Promedio (S/)', 'Puestos_solicitados_2024': 'Puestos Solicitados'},
+        template='plotly_white'
+    )
+    ajuste = ajustar_tendencia(merged_df['Ingreso_promedio'], merged_df['Puestos_solicitados_2024'], modo_tendencia)
+    return agregar_tendencia(fig, ajuste)
+
+
+def figura_top10(vistas, modo_tendencia=None):
+    # Gráfico 4: Top 10 Carreras con Más Puestos Solicitados
+    return px.pie(
+        vistas["top10"],
+        names='Carrera',
+        values='Puestos_solicitados_2024',
+        title='Distribución de Puestos Solicitados entre las Top 10 Carreras',
+        hole=0.3,
+        template='plotly_white'
+    )
+
+
+# Gráficos de las páginas de carreras: nombre -> (encabezado, constructor)
+FIGURAS = {
+    "ingresos": ("Ingreso Promedio por Carrera", figura_ingresos),
+    "demanda": ("Puestos Solicitados por Carrera en 2024", figura_demanda),
+    "relacion": ("Relación entre Ingreso Promedio y Puestos Solicitados", figura_relacion),
+    "top10": ("Top 10 Carreras con Más Puestos Solicitados en 2024", figura_top10),
+}
+
+
+def figura_evolucion(serie):
+    # Evolución de una carrera entre ediciones: ingreso promedio y puestos solicitados
+    fig = px.line(
+        serie,
+        x='edicion',
+        y=['Ingreso_promedio', 'Puestos_solicitados'],
+        facet_row='variable',
+        markers=True,
+        title=f"Evolución de {serie['Carrera'].iloc[-1]} por edición",
+        labels={'edicion': 'Edición', 'value': '', 'variable': ''},
+        template='plotly_white'
+    )
+    fig.update_yaxes(matches=None)
+    fig.for_each_annotation(lambda a: a.update(text=a.text.split("=")[-1].replace("_", " ")))
+    return fig
+
+
+def construir_figura(nombre, vistas, modo_tendencia="ols"):
+    """
+    Construye la figura `nombre` de FIGURAS a partir de las vistas derivadas.
+    """
+    _, constructor = FIGURAS[nombre]
+    return constructor(vistas, modo_tendencia)
+
+
+@metricas.con_contadores("vistas", st.cache_resource(show_spinner=False, max_entries=8))
+def vistas_carreras(tipo, version, region=None):
+    """
+    Vistas derivadas de un tipo de carrera; `version` (huella de los datos) es la clave del caché.
+    Se comparten entre sesiones sin copiarse.
+    """
+    return vistas_derivadas(cargar_carreras(tipo, region))
+
+
+@metricas.con_contadores("figuras", st.cache_data(show_spinner=False))
+def figura_json(tipo, version, nombre, modo_tendencia="ols", region=None):
+    """
+    Figura serializada a JSON, cacheada por versión de los datos, región, nombre y modo de tendencia.
+    """
+    with metricas.tramo(f"construir_figura:{nombre}"):
+        return construir_figura(nombre, vistas_carreras(tipo, version, region), modo_tendencia).to_json()
+
+
+def mostrar_figura(tipo, version, nombre, modo_tendencia="ols", region=None):
+    with metricas.tramo(f"figura:{nombre}"):
+        figura = figura_json(tipo, version, nombre, modo_tendencia, region)
+        st.plotly_chart(pio.from_json(figura), use_container_width=True)
+
+
+@metricas.con_contadores("historico", st.cache_resource(ttl=almacen.INTERVALO_REVISION, show_spinner=False))
+def ediciones_historico():
+    """
+    Ingresa las ediciones nuevas (solo esas se procesan) y devuelve las disponibles.
+    """
+    historico.ingestar()
+    return tuple(historico.ediciones_ingresadas())
+
+
+@metricas.con_contadores("evolucion", st.cache_data(show_spinner=False))
+def evolucion_json(tipo, carrera, ediciones):
+    """
+    Figura de evolución de una carrera, cacheada por las ediciones disponibles.
+    """
+    return figura_evolucion(historico.serie_carrera(carrera, tipo)).to_json()
+
+
+def mostrar_evolucion(tipo):
+    try:
+        ediciones = ediciones_historico()
+    except (requests.RequestException, OSError) as e:
+        st.warning(f"No se pudo actualizar el histórico de ediciones: {e}")
+        return
+    if len(ediciones) < 2:
+        st.info(f"Por ahora solo hay una edición cargada ({', '.join(ediciones)}); "
+                "la evolución se mostrará cuando se agregue la siguiente.")
+        return
+    carrera = st.selectbox("Carrera", cargar_carreras(tipo)['Carrera'], key=f"evolucion_carrera_{tipo}")
+    with metricas.tramo("figura:evolucion"):
+        st.plotly_chart(pio.from_json(evolucion_json(tipo, carrera, ediciones)), use_container_width=True)
+
+
+def mostrar_graficos(tipo):
+    """
+    Muestra los datos combinados y los cuatro gráficos de la página de `tipo`.
+
+    El primer gráfico se muestra siempre; los siguientes están en expanders
+    que solo se ejecutan al abrirse, de modo que un rerun no construye ni
+    envía gráficos que no se están viendo.
+    """
+    # Selector de región, solo si hay libros regionales configurados
+    region = None
+    with metricas.tramo("datos"):
+        regiones = regiones_disponibles(tipo)
+    if regiones:
+        region = st.selectbox("Región", regiones, key=f"region_{tipo}")
+    version = version_carreras(tipo, region)
+
+    # Mostrar el dataframe (opcional)
+    datos = st.expander("Ver Datos Combinados", key=f"datos_{tipo}", on_change="rerun")
+    with datos:
+        if datos.open:
+            with metricas.tramo("tabla"):
+                st.dataframe(cargar_carreras(tipo, region), column_config={"Id_carrera": None})
+
+    encabezado, _ = FIGURAS["ingresos"]
+    st.header(encabezado)
+    mostrar_figura(tipo, version, "ingresos", region=region)
+
+    for nombre in ("demanda", "relacion", "top10"):
+        encabezado, _ = FIGURAS[nombre]
+        seccion = st.expander(encabezado, key=f"{nombre}_{tipo}", on_change="rerun")
+        with seccion:
+            if not seccion.open:
+                continue
+            modo_tendencia = "ols"
+            if nombre == "relacion":
+                modo_tendencia = st.radio(
+                    "Línea de tendencia",
+                    options=list(MODOS),
+                    format_func=MODOS.get,
+                    horizontal=True,
+                    key=f"tendencia_{tipo}"
+                )
+            mostrar_figura(tipo, version, nombre, modo_tendencia, region)
+
+    evolucion = st.expander("Evolución por edición", key=f"evolucion_{tipo}", on_change="rerun")
+    with evolucion:
+        if evolucion.open:
+            mostrar_evolucion(tipo)
@@ -0,0 +1,102 @@
+# modules/historial_chat.py
+
+import math
+import os
+from collections import deque
+
+from modules.contexto import estimar_tokens
+
+# Mensajes que se conservan completos; los más antiguos se resumen
+MAX_MENSAJES = int(os.environ.get("CARRERAS_HISTORIAL_MAX", 40))
+# Mensajes que se dibujan en cada rerun; el resto se consulta por páginas
+VENTANA = int(os.environ.get("CARRERAS_HISTORIAL_VENTANA", 10))
+# Tokens del historial (resumen + turnos recientes) que se envían al modelo
+PRESUPUESTO_TOKENS = int(os.environ.get("CARRERAS_PRESUPUESTO_HISTORIAL", 400))
+# Tamaño máximo del resumen acumulado de los turnos descartados
+MAX_RESUMEN_TOKENS = 150
+
+_LARGO_EXTRACTO = 100
+
+
+def _extracto(texto):
+    texto = " ".join(texto.split())
+    return texto if len(texto) <= _LARGO_EXTRACTO else texto[:_LARGO_EXTRACTO - 1].rstrip() + "…"
+
+
+class HistorialChat:
+    """
+    Historial del chat con tope de mensajes. Al pasar el tope, los turnos más
+    antiguos se reducen a un resumen acumulado (extractos de preguntas y
+    respuestas, también acotado), de modo que una sesión abierta todo el día
+    no crece sin límite en memoria ni en tiempo de dibujo.
+    """
+
+    def __init__(self, max_mensajes=MAX_MENSAJES, max_resumen=MAX_RESUMEN_TOKENS):
+        self.max_mensajes = max_mensajes
+        self.max_resumen = max_resumen
+        self.mensajes = deque()
+        self._resumen = deque()
+        self.resumidos = 0
+
+    def __len__(self):
+        return len(self.mensajes)
+
+    def agregar(self, rol, contenido):
+        self.mensajes.append({"role": rol, "content": contenido})
+        while len(self.mensajes) > self.max_mensajes:
+            self._resumir(self.mensajes.popleft())
+
+    def _resumir(self, mensaje):
+        prefijo = "P" if mensaje["role"] == "user" else "R"
+        self._resumen.append(f"{prefijo}: {_extracto(mensaje['content'])}")
+        self.resumidos += 1
+        while self._resumen and estimar_tokens(" ".join(self._resumen)) > self.max_resumen:
+            self._resumen.popleft()
+
+    def resumen(self):
+        """
+        Resumen de los turnos que ya no se guardan completos ("" si no hay).
+        """
+        if not self._resumen:
+            return ""
+        return "Resumen de la conversación anterior: " + " | ".join(self._resumen)
+
+    def recientes(self, cantidad=VENTANA):
+        """
+        Los últimos `cantidad` mensajes, del más antiguo al más reciente.
+        """
+        inicio = max(len(self.mensajes) - cantidad, 0)
+        return [self.mensajes[i] for i in range(inicio, len(self.mensajes))]
+
+    def paginas(self, tamano=VENTANA):
+        """
+        Número de páginas de mensajes anteriores a la ventana de recientes.
+        """
+        return math.ceil(max(len(self.mensajes) - tamano, 0) / tamano)
+
+    def pagina(self, numero, tamano=VENTANA):
+        """
+        Mensajes de la página `numero` (1 = la más reciente antes de la ventana).
+        """
+        fin = max(len(self.mensajes) - tamano * numero, 0)
+        inicio = max(fin - tamano, 0)
+        return [self.mensajes[i] for i in range(inicio, fin)]
+
+    def mensajes_para_modelo(self, presupuesto=PRESUPUESTO_TOKENS):
+        """
+        Turnos recientes (y el resumen, si cabe) que se envían al modelo, sin
+        pasar de `presupuesto` tokens. Se llenan del más reciente hacia atrás.
+        """
+        elegidos = []
+        usados = 0
+        for mensaje in reversed(self.mensajes):
+            costo = estimar_tokens(mensaje["content"]) + 4
+            if usados + costo > presupuesto:
+                break
+            elegidos.append(mensaje)
+            usados += costo
+        elegidos.reverse()
+        resumen = self.resumen()
+        if resumen and usados + estimar_tokens(resumen) + 4 <= presupuesto:
+            elegidos.insert(0, {"role": "system", "content": resumen})
+        return elegidos
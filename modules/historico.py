@@ -0,0 +1,149 @@
+# modules/historico.py
+
+import json
+import os
+import shutil
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from modules import metricas
+from modules.cache_datos import CACHE_DIR, cargar_snapshot
+from modules.fuentes import FUENTES, PARSERS, TIPOS, combinar, url_fuente
+from modules.limpieza import normalizar_carrera
+
+# Almacén histórico: un dataset Parquet particionado por edición y tipo de carrera
+# (edicion=2024/tipo=universitaria/parte-0.parquet); cada edición se escribe una sola vez
+HISTORICO_DIR = os.environ.get("CARRERAS_HISTORICO_DIR", os.path.join(os.path.dirname(CACHE_DIR), "historico"))
+
+# Ediciones adicionales (mismo diseño de libros) en un JSON opcional:
+# {"2025": {"periodo_ingresos": "...", "anio_demanda": 2025, "fuentes": {"ingresos_universitaria": "https://...", ...}}}
+ARCHIVO_EDICIONES = os.environ.get("CARRERAS_EDICIONES")
+
+# Edición que muestra la app, con las URLs de FUENTES
+EDICIONES = {
+    "2024": {
+        "periodo_ingresos": "noviembre 2022 - octubre 2023",
+        "anio_demanda": 2024,
+        "fuentes": {nombre: url_fuente(nombre) for nombre in FUENTES},
+    },
+}
+
+METRICAS_HISTORICO = ['Ingreso_promedio', 'Ingreso_Minimo', 'Ingreso_Maximo', 'Puestos_solicitados']
+
+# Las particiones se leen como texto: "2024" es el nombre de una edición, no un número
+PARTICIONES = ds.partitioning(pa.schema([("edicion", pa.string()), ("tipo", pa.string())]), flavor="hive")
+
+
+def ediciones():
+    """
+    Ediciones conocidas: las de EDICIONES más las del archivo CARRERAS_EDICIONES.
+    """
+    todas = dict(EDICIONES)
+    if ARCHIVO_EDICIONES:
+        with open(ARCHIVO_EDICIONES, encoding="utf-8") as f:
+            todas.update(json.load(f))
+    return dict(sorted(todas.items()))
+
+
+def ediciones_ingresadas():
+    """
+    Ediciones que ya tienen particiones en el almacén histórico.
+    """
+    if not os.path.isdir(HISTORICO_DIR):
+        return []
+    return sorted(d[len("edicion="):] for d in os.listdir(HISTORICO_DIR) if d.startswith("edicion="))
+
+
+def tablas_edicion(config):
+    """
+    Descarga (o lee de los snapshots) y combina las fuentes de una edición: {tipo: DataFrame}.
+    """
+    tablas = {}
+    for tipo, (ingresos, demanda) in TIPOS.items():
+        leidas = []
+        for nombre in (ingresos, demanda):
+            fuente = FUENTES[nombre]
+            parser = PARSERS[fuente["tabla"]]
+            leidas.append(cargar_snapshot(
+                config["fuentes"][nombre], lambda contenido, fuente=fuente: parser(contenido, fuente), fuente["tabla"]
+            ))
+        # Los Id_carrera valen solo dentro de una versión de los datos: entre ediciones se une por Clave
+        df = combinar(*leidas, tipo=tipo).drop(columns='Id_carrera')
+        df = df.rename(columns={'Puestos_solicitados_2024': 'Puestos_solicitados'})
+        df.insert(1, 'Clave', df['Carrera'].map(normalizar_carrera))
+        tablas[tipo] = df
+    return tablas
+
+
+def ingestar(forzar=False):
+    """
+    Agrega al almacén las ediciones que aún no tiene; las particiones existentes
+    no se leen ni se reescriben. Devuelve las ediciones ingresadas.
+    """
+    existentes = set(ediciones_ingresadas())
+    nuevas = []
+    for edicion, config in ediciones().items():
+        if edicion in existentes and not forzar:
+            continue
+        with metricas.tramo(f"ingesta:{edicion}"):
+            tablas = tablas_edicion(config)
+            # Se escribe en un directorio oculto y se renombra: nunca queda una edición a medias
+            temporal = os.path.join(HISTORICO_DIR, f".edicion={edicion}.{os.getpid()}")
+            for tipo, df in tablas.items():
+                os.makedirs(os.path.join(temporal, f"tipo={tipo}"), exist_ok=True)
+                df.to_parquet(os.path.join(temporal, f"tipo={tipo}", "parte-0.parquet"), index=False)
+            destino = os.path.join(HISTORICO_DIR, f"edicion={edicion}")
+            if forzar and os.path.isdir(destino):
+                shutil.rmtree(destino)
+            try:
+                os.rename(temporal, destino)
+            except OSError:
+                # Otro proceso ingresó la misma edición primero
+                shutil.rmtree(temporal, ignore_errors=True)
+                continue
+        nuevas.append(edicion)
+    return nuevas
+
+
+def consultar(columnas, tipo=None, ediciones=None, clave=None):
+    """
+    Lee del almacén solo `columnas`, y solo las particiones del `tipo` y las
+    `ediciones` pedidas (todas si son None). `clave` filtra una carrera.
+    """
+    filtro = None
+    condiciones = []
+    if tipo is not None:
+        condiciones.append(ds.field("tipo") == tipo)
+    if ediciones is not None:
+        condiciones.append(ds.field("edicion").isin(list(ediciones)))
+    if clave is not None:
+        condiciones.append(ds.field("Clave") == clave)
+    for condicion in condiciones:
+        filtro = condicion if filtro is None else filtro & condicion
+    dataset = ds.dataset(HISTORICO_DIR, format="parquet", partitioning=PARTICIONES)
+    with metricas.tramo("consulta_historico"):
+        return dataset.to_table(columns=list(columnas), filter=filtro).to_pandas()
+
+
+def serie_carrera(carrera, tipo=None):
+    """
+    Valores de una carrera en cada edición, ordenados por edición.
+    """
+    df = consultar(['edicion', 'tipo', 'Carrera', *METRICAS_HISTORICO], tipo=tipo, clave=normalizar_carrera(carrera))
+    return df.sort_values(['tipo', 'edicion'], ignore_index=True)
+
+
+def variacion_anual(tipo, columna, desde, hasta):
+    """
+    Variación de `columna` entre dos ediciones para cada carrera de `tipo`
+    (lee solo esas dos particiones). Columnas: Carrera, desde, hasta, Variacion (%).
+    """
+    df = consultar(['edicion', 'Clave', 'Carrera', columna], tipo=tipo, ediciones=(desde, hasta))
+    nombres = df.drop_duplicates('Clave', keep='last').set_index('Clave')['Carrera']
+    tabla = df.pivot_table(index='Clave', columns='edicion', values=columna, aggfunc='first')
+    tabla = tabla.reindex(columns=[desde, hasta]).dropna()
+    tabla.columns.name = None
+    tabla['Variacion'] = ((tabla[hasta] / tabla[desde] - 1) * 100).round(1)
+    tabla.insert(0, 'Carrera', nombres.reindex(tabla.index))
+    return tabla.reset_index(drop=True).sort_values('Variacion', ascending=False, ignore_index=True)
@@ -0,0 +1,126 @@
+# modules/lector_excel.py
+
+import re
+
+import pandas as pd
+
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:  # calamine es opcional; sin él se usa openpyxl en modo streaming
+    CalamineWorkbook = None
+
+MOTORES = ("calamine", "openpyxl")
+
+# Un valor de la tabla es un número o un texto que empieza con un monto ("S/ 1 234", "900 - 1 500")
+_PATRON_VALOR = re.compile(r'^\s*(?:S/\.?)?\s*\d')
+
+# Notas al pie debajo de la tabla: "(1) ...", "Nota: ...", "Fuente: ...", "Elaboración: ..."
+_PATRON_NOTA = re.compile(r'^\s*(?:\(\d+\)|\*|notas?\b|fuente\b|elaboraci[oó]n\b)', re.IGNORECASE)
+
+
+def _vacia(celda):
+    return celda is None or (isinstance(celda, str) and not celda.strip())
+
+
+def _es_valor(celda):
+    if isinstance(celda, bool):
+        return False
+    if isinstance(celda, (int, float)):
+        return True
+    return isinstance(celda, str) and bool(_PATRON_VALOR.match(celda))
+
+
+def _es_carrera(celda):
+    return (
+        isinstance(celda, str)
+        and not _vacia(celda)
+        and celda.strip().lower() != "total"
+        and not _PATRON_NOTA.match(celda)
+    )
+
+
+def _inicia_tabla(fila):
+    # La primera fila de datos: una carrera y un monto en la primera columna de valores
+    return _es_carrera(fila[0]) and _es_valor(fila[1])
+
+
+def _continua_tabla(fila):
+    # Las siguientes pueden traer celdas vacías o "-", incluso en todas las columnas de
+    # valores (quedan como <NA> al limpiar): la tabla sigue mientras haya una carrera y
+    # termina en una fila vacía, de notas, de fuente o de total
+    return _es_carrera(fila[0])
+
+
+def _rango_columnas(usecols):
+    from openpyxl.utils import column_index_from_string
+
+    primera, _, ultima = usecols.partition(":")
+    return column_index_from_string(primera), column_index_from_string(ultima or primera)
+
+
+def _filas_openpyxl(contenido, primera, ultima):
+    # openpyxl se importa aquí: solo hace falta cuando no hay snapshot vigente
+    from openpyxl import load_workbook
+
+    # read_only recorre el XML de la hoja fila por fila sin cargar el libro completo
+    wb = load_workbook(contenido, read_only=True, data_only=True)
+    try:
+        for fila in wb.worksheets[0].iter_rows(min_col=primera, max_col=ultima, values_only=True):
+            yield fila
+    finally:
+        wb.close()
+
+
+def _filas_calamine(contenido, primera, ultima):
+    hoja = CalamineWorkbook.from_filelike(contenido).get_sheet_by_index(0)
+    # calamine omite las columnas vacías iniciales; ajustar el desplazamiento
+    desde = primera - 1 - hoja.start[1]
+    ancho = ultima - primera + 1
+    for fila in hoja.iter_rows():
+        fila = list(fila[max(desde, 0):desde + ancho]) if desde + ancho > 0 else []
+        yield tuple(fila + [None] * (ancho - len(fila)))
+
+
+def motor_por_defecto():
+    """
+    Devuelve el motor más rápido disponible.
+    """
+    return "calamine" if CalamineWorkbook is not None else "openpyxl"
+
+
+def iterar_filas(contenido, usecols, motor=None):
+    """
+    Recorre en streaming las filas de la primera hoja limitadas a `usecols` (por ejemplo "C:E").
+    """
+    motor = motor or motor_por_defecto()
+    if motor not in MOTORES:
+        raise ValueError(f"Motor de Excel desconocido: {motor}")
+    if motor == "calamine" and CalamineWorkbook is None:
+        raise ImportError("python-calamine no está instalado")
+    primera, ultima = _rango_columnas(usecols)
+    if motor == "calamine":
+        return _filas_calamine(contenido, primera, ultima)
+    return _filas_openpyxl(contenido, primera, ultima)
+
+
+def leer_tabla(contenido, usecols, columnas, motor=None):
+    """
+    Lee la tabla de un archivo del MTPE detectando sus límites.
+
+    La tabla empieza en la primera fila cuya primera columna es una carrera y
+    cuya segunda columna es un monto. Sigue mientras la primera columna sea una
+    carrera, aunque sus valores estén vacíos o tengan "-", y termina en la primera
+    fila vacía, de notas, de fuente o de total. La lectura se detiene ahí, sin
+    recorrer el resto de la hoja.
+    """
+    filas = []
+    iterador = iterar_filas(contenido, usecols, motor)
+    try:
+        for fila in iterador:
+            if _continua_tabla(fila) if filas else _inicia_tabla(fila):
+                filas.append((fila[0].strip(),) + tuple(fila[1:]))
+            elif filas:
+                break
+    finally:
+        iterador.close()
+    return pd.DataFrame(filas, columns=columnas)
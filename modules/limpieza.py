@@ -0,0 +1,75 @@
+# modules/limpieza.py
+
+import re
+import unicodedata
+
+import pandas as pd
+
+# Número con espacios como separador de miles, por ejemplo "1 234" o "12 345 678"
+PATRON_NUMERO = r'(\d{1,3}(?:\s\d{3})*)'
+
+# Carreras agrupadas por el MTPE (notas al pie de los cuadros): nombre del grupo -> carreras que comprende
+ALIAS = {
+    ("universitaria", "otras carreras de administracion"): (
+        "Gestión y Alta Dirección", "Relaciones Industriales", "Gestión de Recursos Humanos",
+    ),
+    ("universitaria", "otras ingenierias"): ("Ingeniería de Transportes", "Ingeniería automotriz"),
+    ("universitaria", "otras carreras de educacion"): ("Educación", "Ciencias de la Educación"),
+    ("tecnica", "otras carreras de administracion"): (
+        "Administración de Recursos Humanos", "Administración de Servicios de Postales", "Administrativo",
+        "Agencia de Desarrollo Integral", "Planificación Empresarial", "Planificación y Gestión de Desarrollo",
+        "Supervisión de Operaciones",
+    ),
+    ("tecnica", "otras carreras de educacion"): ("Educación", "Educación Básica Alternativa"),
+}
+
+
+def limpiar_moneda(serie):
+    """
+    Convierte valores como "S/ 1 234" en enteros (Int64), descartando todo
+    carácter que no sea dígito. Las celdas que ya son numéricas se conservan
+    y los valores vacíos quedan como <NA>.
+    """
+    numeros = pd.to_numeric(serie, errors='coerce')
+    if numeros.notna().all():
+        return numeros.round().astype('Int64')
+    digitos = serie.where(numeros.isna()).astype('string').str.replace(r'\D', '', regex=True)
+    texto = pd.to_numeric(digitos.replace('', pd.NA))
+    return numeros.fillna(texto).round().astype('Int64')
+
+
+def extraer_rango(serie, columnas=('Ingreso_Minimo', 'Ingreso_Maximo')):
+    """
+    Extrae el mínimo y el máximo de textos como "S/ 1 200 - S/ 3 400".
+
+    Toma los dos primeros números de cada valor; si hay menos de dos, ambos
+    quedan como <NA>. Devuelve un DataFrame con dos columnas Int64 alineado
+    con el índice de `serie`.
+    """
+    numeros = serie.astype('string').str.extractall(PATRON_NUMERO)[0]
+    numeros = numeros.str.replace(r'\D', '', regex=True)
+    partes = numeros.unstack('match').reindex(index=serie.index, columns=[0, 1])
+
+    completos = partes[1].notna()
+    resultado = pd.DataFrame(index=serie.index)
+    resultado[columnas[0]] = pd.to_numeric(partes[0].where(completos)).astype('Int64')
+    resultado[columnas[1]] = pd.to_numeric(partes[1].where(completos)).astype('Int64')
+    return resultado
+
+
+def normalizar_pregunta(texto):
+    """
+    Normaliza una pregunta para que variantes triviales compartan respuesta:
+    minúsculas, sin tildes, sin signos de puntuación y con espacios simples.
+    """
+    texto = unicodedata.normalize("NFKD", texto.lower())
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    texto = re.sub(r"[^\w\s]", " ", texto)
+    return " ".join(texto.split())
+
+
+def normalizar_carrera(nombre):
+    """
+    Nombre de carrera en forma comparable: sin marcas de nota como "(3)", sin tildes ni mayúsculas.
+    """
+    return normalizar_pregunta(re.sub(r'\(\d+\)', ' ', str(nombre)))
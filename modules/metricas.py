@@ -0,0 +1,222 @@
+# modules/metricas.py
+#
+# Instrumentación liviana (solo biblioteca estándar, se importa en el arranque):
+# tramos de tiempo por rerun, contadores de aciertos/fallos de cada caché y
+# exportación como logs JSON y en formato de texto de Prometheus.
+
+import contextvars
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger("carreras.metricas")
+
+# Límites (segundos) de los buckets del histograma de tramos
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+# Destino opcional de los logs JSON (una línea por rerun): ruta de archivo o "-" para stderr
+LOG_JSON = os.environ.get("CARRERAS_METRICAS_JSON")
+# Archivo opcional que se reescribe tras cada rerun con la exportación Prometheus
+# (para el textfile collector de node_exporter)
+ARCHIVO_PROMETHEUS = os.environ.get("CARRERAS_METRICAS_PROM")
+# Objetivo de latencia por rerun en milisegundos; los reruns más lentos se cuentan y se registran
+SLO_RERUN_MS = float(os.environ.get("CARRERAS_SLO_RERUN_MS", 0)) or None
+
+_rerun = contextvars.ContextVar("carreras_rerun", default=None)
+_nivel = contextvars.ContextVar("carreras_nivel", default=0)
+_lock = threading.Lock()
+_histogramas = {}
+_contadores = {}
+_pila_cache = threading.local()
+
+if LOG_JSON:
+    _handler = logging.StreamHandler(sys.stderr) if LOG_JSON == "-" else logging.FileHandler(LOG_JSON, encoding="utf-8")
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+def iniciar_rerun():
+    """
+    Empieza a registrar los tramos y contadores del rerun actual y devuelve su registro.
+    """
+    rerun = {"inicio": time.time(), "tramos": [], "contadores": {}}
+    _rerun.set(rerun)
+    return rerun
+
+
+@contextmanager
+def tramo(nombre):
+    """
+    Mide el bloque como un tramo `nombre`: se agrega al rerun actual y al histograma del proceso.
+    """
+    nivel = _nivel.get()
+    token = _nivel.set(nivel + 1)
+    # Se agrega al empezar para que los tramos anidados queden debajo de su tramo padre
+    registro = {"nombre": nombre, "ms": None, "nivel": nivel}
+    rerun = _rerun.get()
+    if rerun is not None:
+        rerun["tramos"].append(registro)
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        segundos = time.perf_counter() - inicio
+        _nivel.reset(token)
+        registro["ms"] = round(segundos * 1000, 2)
+        with _lock:
+            conteos, suma, n = _histogramas.get(nombre, ([0] * len(BUCKETS), 0.0, 0))
+            conteos = [c + (segundos <= limite) for c, limite in zip(conteos, BUCKETS)]
+            _histogramas[nombre] = (conteos, suma + segundos, n + 1)
+
+
+def contar(nombre, valor=1, **etiquetas):
+    """
+    Suma `valor` al contador `nombre` con `etiquetas`, en el proceso y en el rerun actual.
+    """
+    clave = (nombre, tuple(sorted(etiquetas.items())))
+    with _lock:
+        _contadores[clave] = _contadores.get(clave, 0) + valor
+        rerun = _rerun.get()
+        if rerun is not None:
+            texto = nombre + "".join(f" {k}={v}" for k, v in clave[1])
+            rerun["contadores"][texto] = rerun["contadores"].get(texto, 0) + valor
+
+
+def contar_cache(capa, acierto):
+    contar("cache", capa=capa, resultado="acierto" if acierto else "fallo")
+
+
+def con_contadores(capa, cache):
+    """
+    Aplica el decorador de caché `cache` (st.cache_data, st.cache_resource, ...)
+    contando aciertos y fallos en la capa `capa`: es un fallo cuando el cuerpo
+    de la función llega a ejecutarse.
+    """
+    def decorar(funcion):
+        @functools.wraps(funcion)
+        def calcular(*args, **kwargs):
+            marcas = getattr(_pila_cache, "marcas", None)
+            if marcas:
+                marcas[-1] = True
+            return funcion(*args, **kwargs)
+
+        cacheada = cache(calcular)
+
+        @functools.wraps(funcion)
+        def consultar(*args, **kwargs):
+            if not hasattr(_pila_cache, "marcas"):
+                _pila_cache.marcas = []
+            _pila_cache.marcas.append(False)
+            try:
+                return cacheada(*args, **kwargs)
+            finally:
+                contar_cache(capa, not _pila_cache.marcas.pop())
+
+        consultar.clear = cacheada.clear
+        return consultar
+    return decorar
+
+
+def en_contexto(funcion):
+    """
+    Envuelve `funcion` para ejecutarla en otro hilo sin perder el rerun actual.
+    """
+    return functools.partial(contextvars.copy_context().run, funcion)
+
+
+def terminar_rerun(pagina):
+    """
+    Cierra el rerun actual: calcula su duración, la compara con el SLO y exporta
+    el registro como log JSON y el archivo Prometheus, si están configurados.
+    """
+    rerun = _rerun.get()
+    if rerun is None:
+        return None
+    rerun["pagina"] = pagina
+    rerun["total_ms"] = round((time.time() - rerun["inicio"]) * 1000, 2)
+    if SLO_RERUN_MS and rerun["total_ms"] > SLO_RERUN_MS:
+        contar("slo_excedido", pagina=pagina)
+        logger.warning(json.dumps({"evento": "slo_excedido", "pagina": pagina, "total_ms": rerun["total_ms"],
+                                   "slo_ms": SLO_RERUN_MS}, ensure_ascii=False))
+    logger.info(json.dumps({"evento": "rerun", **rerun}, ensure_ascii=False))
+    if ARCHIVO_PROMETHEUS:
+        _escribir_prometheus(ARCHIVO_PROMETHEUS)
+    _rerun.set(None)
+    return rerun
+
+
+def _escribir_prometheus(ruta):
+    # Cada sesión termina sus reruns en su propio hilo: el temporal lleva el hilo además del
+    # proceso para que dos escrituras simultáneas no se pisen. Un fallo al exportar no debe
+    # llegar a la página; se registra y el siguiente rerun lo vuelve a intentar
+    tmp = f"{ruta}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(exportar_prometheus())
+        os.replace(tmp, ruta)
+    except Exception as e:
+        logger.warning(json.dumps({"evento": "error_prometheus", "archivo": ruta, "error": str(e)}, ensure_ascii=False))
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+
+def _etiquetas(pares):
+    if not pares:
+        return ""
+    escapar = lambda v: str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{k}="{escapar(v)}"' for k, v in pares) + "}"
+
+
+def exportar_prometheus():
+    """
+    Métricas del proceso en el formato de texto de Prometheus.
+    """
+    with _lock:
+        histogramas = dict(_histogramas)
+        contadores = dict(_contadores)
+
+    lineas = [
+        "# HELP carreras_tramo_segundos Duración de los tramos instrumentados.",
+        "# TYPE carreras_tramo_segundos histogram",
+    ]
+    for nombre, (conteos, suma, n) in sorted(histogramas.items()):
+        for limite, conteo in zip(BUCKETS, conteos):
+            lineas.append(f"carreras_tramo_segundos_bucket{_etiquetas([('tramo', nombre), ('le', limite)])} {conteo}")
+        lineas.append(f"carreras_tramo_segundos_bucket{_etiquetas([('tramo', nombre), ('le', '+Inf')])} {n}")
+        lineas.append(f"carreras_tramo_segundos_sum{_etiquetas([('tramo', nombre)])} {suma:.6f}")
+        lineas.append(f"carreras_tramo_segundos_count{_etiquetas([('tramo', nombre)])} {n}")
+
+    for metrica in sorted({nombre for nombre, _ in contadores}):
+        lineas.append(f"# TYPE carreras_{metrica}_total counter")
+        for (nombre, pares), valor in sorted(contadores.items()):
+            if nombre == metrica:
+                lineas.append(f"carreras_{metrica}_total{_etiquetas(pares)} {valor}")
+    return "\n".join(lineas) + "\n"
+
+
+def resumen_caches():
+    """
+    Aciertos, fallos y tasa de aciertos de cada capa de caché en el proceso.
+    """
+    with _lock:
+        contadores = dict(_contadores)
+    capas = {}
+    for (nombre, pares), valor in contadores.items():
+        if nombre != "cache":
+            continue
+        etiquetas = dict(pares)
+        capa = capas.setdefault(etiquetas["capa"], {"acierto": 0, "fallo": 0})
+        capa[etiquetas["resultado"]] += valor
+    for capa in capas.values():
+        total = capa["acierto"] + capa["fallo"]
+        capa["tasa_aciertos"] = round(capa["acierto"] / total, 3) if total else 0.0
+    return capas
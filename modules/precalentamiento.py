@@ -0,0 +1,77 @@
+# modules/precalentamiento.py
+
+import importlib
+import logging
+import os
+import threading
+import time
+
+import streamlit as st
+
+from modules import metricas
+
+logger = logging.getLogger(__name__)
+
+# CARRERAS_PRECALENTAR=0 desactiva el precalentamiento (por ejemplo, en desarrollo)
+ACTIVO = os.environ.get("CARRERAS_PRECALENTAR", "1") != "0"
+
+# Responder de antemano las sugerencias del chat consume llamadas al modelo: es opcional
+PRECALENTAR_SUGERENCIAS = os.environ.get("CARRERAS_PRECALENTAR_SUGERENCIAS") == "1"
+
+
+def _etapas():
+    # Los módulos se importan en el hilo de fondo: pandas, plotly y los datos se
+    # cargan sin retrasar la primera pintura de la app
+    datos = importlib.import_module("modules.datos")
+    fuentes = importlib.import_module("modules.fuentes")
+    graficos = importlib.import_module("modules.graficos")
+    preguntas = importlib.import_module("paginas.preguntas")
+
+    def figuras():
+        for tipo in fuentes.TIPOS:
+            version = datos.version_carreras(tipo, None)
+            # Mismos argumentos que mostrar_figura, para que las páginas encuentren la misma clave de caché
+            for nombre in graficos.FIGURAS:
+                graficos.figura_json(tipo, version, nombre, "ols", None)
+
+    def chat():
+        version = datos.version_combinado()
+        preguntas.cargar_contexto(version)
+        preguntas.obtener_indice(version)
+        preguntas.obtener_motor(version)
+
+    etapas = [("datos", datos.manifiesto_datos), ("figuras", figuras), ("chat", chat)]
+    if PRECALENTAR_SUGERENCIAS:
+        etapas.append(("sugerencias", preguntas.responder_sugerencias))
+    return etapas
+
+
+def _precalentar(estado):
+    try:
+        for etapa, funcion in _etapas():
+            inicio = time.perf_counter()
+            with metricas.tramo(f"precalentamiento:{etapa}"):
+                funcion()
+            estado["etapas"][etapa] = round((time.perf_counter() - inicio) * 1000, 1)
+    except Exception as e:
+        # Las páginas siguen funcionando: cargan lo que falte al pedirlo
+        logger.warning("Falló el precalentamiento (%s)", e)
+        estado["error"] = str(e)
+        return
+    finally:
+        estado["terminado"] = time.time()
+    estado["listo"] = True
+    logger.info("Precalentamiento terminado: %s", estado["etapas"])
+
+
+@st.cache_resource(show_spinner=False)
+def iniciar():
+    """
+    Lanza una sola vez por proceso, en un hilo de fondo, la carga de los datos, los
+    gráficos y los índices del chat (y opcionalmente las respuestas a las sugerencias).
+    Devuelve el estado, que se actualiza a medida que avanza; `listo` indica que terminó.
+    """
+    estado = {"listo": not ACTIVO, "inicio": time.time(), "terminado": None, "etapas": {}, "error": None}
+    if ACTIVO:
+        threading.Thread(target=_precalentar, args=(estado,), name="precalentamiento", daemon=True).start()
+    return estado
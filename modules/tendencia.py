@@ -0,0 +1,102 @@
+# modules/tendencia.py
+
+from functools import lru_cache
+
+import numpy as np
+import plotly.graph_objects as go
+
+# Tipos de ajuste disponibles para la línea de tendencia
+MODOS = {
+    "ols": "Lineal (mínimos cuadrados)",
+    "log": "Log-log (potencia)",
+    "robusta": "Robusta (Theil-Sen)",
+}
+
+
+def _theil_sen(x, y):
+    # Mediana de las pendientes entre todos los pares de puntos; resistente a valores atípicos
+    i, j = np.triu_indices(len(x), k=1)
+    dx = x[j] - x[i]
+    validos = dx != 0
+    pendiente = np.median((y[j] - y[i])[validos] / dx[validos])
+    return pendiente, np.median(y - pendiente * x)
+
+
+def _minimos_cuadrados(x, y):
+    x_media, y_media = x.mean(), y.mean()
+    sxx = np.sum((x - x_media) ** 2)
+    pendiente = np.sum((x - x_media) * (y - y_media)) / sxx
+    return pendiente, y_media - pendiente * x_media
+
+
+@lru_cache(maxsize=32)
+def _ajustar(x, y, modo):
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    validos = np.isfinite(x) & np.isfinite(y)
+    if modo == "log":
+        validos &= (x > 0) & (y > 0)
+    x, y = x[validos], y[validos]
+    if modo == "log":
+        x, y = np.log10(x), np.log10(y)
+    if len(x) < 2 or np.ptp(x) == 0:
+        return None
+
+    if modo == "robusta":
+        pendiente, intercepto = _theil_sen(x, y)
+    else:
+        pendiente, intercepto = _minimos_cuadrados(x, y)
+
+    # R² en el espacio del ajuste (logarítmico en el modo log)
+    ss_res = np.sum((y - (pendiente * x + intercepto)) ** 2)
+    ss_tot = np.sum((y - y.mean()) ** 2)
+    r2 = 1 - ss_res / ss_tot if ss_tot > 0 else float("nan")
+    return {
+        "modo": modo,
+        "pendiente": float(pendiente),
+        "intercepto": float(intercepto),
+        "r2": float(r2),
+        "n": int(len(x)),
+        "x_min": float(x.min()),
+        "x_max": float(x.max()),
+    }
+
+
+def ajustar_tendencia(x, y, modo="ols"):
+    """
+    Calcula la recta de tendencia de `y` sobre `x` en forma cerrada.
+
+    Devuelve un diccionario con pendiente, intercepto, R² y el rango de x,
+    o None si no hay suficientes puntos. El resultado se memoriza por datos
+    y modo, de modo que los reruns de Streamlit no vuelven a ajustar.
+    """
+    if modo not in MODOS:
+        raise ValueError(f"Modo de tendencia desconocido: {modo}")
+    x = tuple(np.asarray(x, dtype=float).tolist())
+    y = tuple(np.asarray(y, dtype=float).tolist())
+    return _ajustar(x, y, modo)
+
+
+def agregar_tendencia(fig, ajuste, puntos=50):
+    """
+    Agrega la línea de tendencia de `ajuste` a `fig` como una traza de líneas.
+    """
+    if ajuste is None:
+        return fig
+    xs = np.linspace(ajuste["x_min"], ajuste["x_max"], puntos)
+    ys = ajuste["pendiente"] * xs + ajuste["intercepto"]
+    if ajuste["modo"] == "log":
+        xs, ys = 10 ** xs, 10 ** ys
+        # En escala log-log la curva de potencia se ve como una recta
+        fig.update_xaxes(type="log")
+        fig.update_yaxes(type="log")
+
+    fig.add_trace(go.Scatter(
+        x=xs,
+        y=ys,
+        mode="lines",
+        name=f"Tendencia {MODOS[ajuste['modo']].lower()} (R² = {ajuste['r2']:.3f})",
+        hoverinfo="skip",
+        line={"dash": "dash"},
+    ))
+    return fig
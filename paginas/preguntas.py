@@ -1,175 +1,229 @@
 # paginas/preguntas.py
 
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import re
 import requests
-import json
-
-def display():
-    st.title("Chat de Preguntas y Respuestas")
-
-    # Cargar la clave de RapidAPI desde los secretos de Streamlit
-    rapidapi_key = st.secrets["RAPIDAPI"]["key"]
+from modules import cliente_llm, metricas
+from modules.cache_respuestas import huella_conversacion, huella_texto, obtener_cache_respuestas
+from modules.coordinador_llm import ServicioSaturado, obtener_coordinador
+from modules.consultas import MotorConsultas
+from modules.contexto import IndiceContexto, construir_contexto
+from modules.datos import cargar_combinado, cargar_dimension, version_combinado
+from modules.historial_chat import VENTANA, HistorialChat
+from modules.limpieza import normalizar_pregunta
+
+# Sugerencias de preguntas que se muestran como botones
+SUGERENCIAS = [
+    "¿Cuál es la carrera universitaria con mayor ingreso promedio?",
+    "¿Cuántos puestos se solicitaron para Ingeniería de Transportes en 2024?",
+    "¿Cuál es el ingreso máximo de Administración de Recursos Humanos?",
+    "¿Qué carrera técnica tiene el ingreso mínimo más alto?",
+    "¿Cuáles son las top 5 carreras con más puestos solicitados en 2024?"
+]
+
+
+def es_autonoma(pregunta):
+    """
+    Indica si `pregunta` se entiende sin la conversación (por ahora, las SUGERENCIAS):
+    se envía sin turnos previos y comparte el caché con las demás sesiones.
+    """
+    return normalizar_pregunta(pregunta) in {normalizar_pregunta(s) for s in SUGERENCIAS}
 
-    # Inicializar el historial de chat en la sesión
-    if 'chat_history' not in st.session_state:
-        st.session_state.chat_history = []
 
-    # Función para generar la respuesta basada en la entrada del usuario
-    def generar_respuesta_rapidapi(user_input, context):
-        url = "https://cheapest-gpt-4-turbo-gpt-4-vision-chatgpt-openai-ai-api.p.rapidapi.com/v1/chat/completions"
-        
-        prompt = f"""
+def mensajes_modelo(user_input, context, anteriores=()):
+    """
+    Mensajes para el modelo: los turnos anteriores (recortados a un presupuesto
+    de tokens) seguidos de la pregunta actual con su contexto.
+    """
+    prompt = f"""
         Contexto:
         {context}
         
         Usuario: {user_input}
         Asistente:
         """
-
-        payload = {
-            "messages": [
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            "model": "gpt-4",
-            "max_tokens": 1000,
-            "temperature": 0.7
-        }
-        headers = {
-            "x-rapidapi-key": rapidapi_key,
-            "x-rapidapi-host": "cheapest-gpt-4-turbo-gpt-4-vision-chatgpt-openai-ai-api.p.rapidapi.com",
-            "Content-Type": "application/json"
+    return list(anteriores) + [
+        {
+            "role": "user",
+            "content": prompt
         }
+    ]
 
-        try:
-            response = requests.post(url, json=payload, headers=headers)
-            response.raise_for_status()  # Raise an exception for bad status codes
-            result = response.json()
-            return result['choices'][0]['message']['content'].strip()
-        except requests.RequestException as e:
-            st.error(f"Error al comunicarse con la API de RapidAPI: {e}")
-            return ""
-        except Exception as e:
-            st.error(f"Error inesperado: {e}")
-            return ""
 
-    # Función para cargar y preparar los datos como contexto
-    @st.cache_data
-    def cargar_contexto():
-        # URLs de los archivos Excel
-        ingresos_universitaria_url = "https://cdn.www.gob.pe/uploads/document/file/5901478/5207826-universitarias_mp_nacional.xlsx"
-        demanda_universitaria_url = "https://cdn.www.gob.pe/uploads/document/file/5988129/5306104-md_universitarias_nacional.xlsx"
-        ingresos_tecnica_url = "https://cdn.www.gob.pe/uploads/document/file/5901305/5207826-tecnicas_mp_nacional.xlsx"
-        demanda_tecnica_url = "https://cdn.www.gob.pe/uploads/document/file/5988189/5306104-md_tecnicas_nacional.xlsx"
+def clave_llamada(pregunta, huella_contexto, conversacion=""):
+    """
+    Clave con que se comparten las llamadas al modelo entre sesiones: la misma
+    pregunta, con los mismos datos y, si la hay, la misma conversación previa.
+    """
+    clave = (normalizar_pregunta(pregunta), huella_contexto)
+    return clave + (conversacion,) if conversacion else clave
 
-        # Cargar datos universitarias
-        ingresos_uni_df = pd.read_excel(ingresos_universitaria_url, usecols="C:E", skiprows=4, nrows=68)
-        ingresos_uni_df.columns = ['Carrera', 'Ingreso_promedio', 'Minimo_Maximo']
 
-        ingresos_uni_df['Ingreso_promedio'] = ingresos_uni_df['Ingreso_promedio'].astype(str).str.replace(r'[^\d]', '', regex=True).astype(int)
+# Contexto completo (se usa como huella de los datos para el caché de respuestas)
+@metricas.con_contadores("contexto", st.cache_data(show_spinner=False))
+def cargar_contexto(version):
+    # Carreras universitarias y técnicas combinadas (compartidas con las páginas de gráficos)
+    return construir_contexto(cargar_combinado())
 
-        def extract_min_max(s):
-            numbers = re.findall(r'\d{1,3}(?:\s\d{3})*', s)
-            if len(numbers) >= 2:
-                min_val = int(numbers[0].replace(' ', ''))
-                max_val = int(numbers[1].replace(' ', ''))
-                return pd.Series([min_val, max_val])
-            else:
-                return pd.Series([None, None])
 
-        ingresos_uni_df[['Ingreso_Minimo', 'Ingreso_Maximo']] = ingresos_uni_df['Minimo_Maximo'].apply(extract_min_max)
-        ingresos_uni_df.drop('Minimo_Maximo', axis=1, inplace=True)
+# Índice local de carreras: cada pregunta envía solo las filas relevantes
+@metricas.con_contadores("indice", st.cache_resource(show_spinner=False))
+def obtener_indice(version):
+    return IndiceContexto(cargar_combinado(), cargar_dimension())
 
-        demanda_uni_df = pd.read_excel(demanda_universitaria_url, usecols="C:D", skiprows=4, nrows=60)
-        demanda_uni_df.columns = ['Carrera', 'Puestos_solicitados_2024']
-        demanda_uni_df['Puestos_solicitados_2024'] = demanda_uni_df['Puestos_solicitados_2024'].astype(str).str.replace(r'[^\d]', '', regex=True).astype(int)
 
-        # Cargar datos técnicas
-        ingresos_tecnica_df = pd.read_excel(ingresos_tecnica_url, usecols="C:E", skiprows=4, nrows=31)
-        ingresos_tecnica_df.columns = ['Carrera', 'Ingreso_promedio', 'Minimo_Maximo']
-        ingresos_tecnica_df['Ingreso_promedio'] = ingresos_tecnica_df['Ingreso_promedio'].astype(str).str.replace(r'[^\d]', '', regex=True).astype(int)
-        ingresos_tecnica_df[['Ingreso_Minimo', 'Ingreso_Maximo']] = ingresos_tecnica_df['Minimo_Maximo'].apply(extract_min_max)
-        ingresos_tecnica_df.drop('Minimo_Maximo', axis=1, inplace=True)
+# Motor de consultas locales, construido una vez por versión de los datos
+@metricas.con_contadores("motor", st.cache_resource(show_spinner=False))
+def obtener_motor(version):
+    return MotorConsultas(cargar_combinado(), cargar_dimension())
 
-        demanda_tecnica_df = pd.read_excel(demanda_tecnica_url, usecols="C:D", skiprows=4, nrows=39)
-        demanda_tecnica_df.columns = ['Carrera', 'Puestos_solicitados_2024']
-        demanda_tecnica_df['Puestos_solicitados_2024'] = demanda_tecnica_df['Puestos_solicitados_2024'].astype(str).str.replace(r'[^\d]', '', regex=True).astype(int)
 
-        # Unir datasets universitarias
-        merged_uni_df = pd.merge(ingresos_uni_df, demanda_uni_df, on='Carrera', how='inner')
+def responder_sugerencias():
+    """
+    Deja en el caché de respuestas las SUGERENCIAS que no se responden localmente,
+    con la misma clave que usa el chat. Devuelve cuántas se enviaron al modelo.
+    """
+    version = version_combinado()
+    huella_contexto = huella_texto(cargar_contexto(version))
+    cache = obtener_cache_respuestas()
+    enviadas = 0
+    for sugerencia in SUGERENCIAS:
+        if obtener_motor(version).responder(sugerencia) or cache.obtener(sugerencia, huella_contexto):
+            continue
+        mensajes = mensajes_modelo(sugerencia, obtener_indice(version).seleccionar(sugerencia))
+        respuesta = obtener_coordinador().ejecutar(
+            clave_llamada(sugerencia, huella_contexto),
+            lambda: cliente_llm.completar(mensajes, st.secrets["RAPIDAPI"]["key"],
+                                          st.secrets["RAPIDAPI"].get("url", cliente_llm.URL)),
+        ).strip()
+        if respuesta:
+            cache.guardar(sugerencia, huella_contexto, respuesta)
+        enviadas += 1
+    return enviadas
 
-        # Unir datasets técnicas
-        merged_tecnica_df = pd.merge(ingresos_tecnica_df, demanda_tecnica_df, on='Carrera', how='inner')
 
-        # Combinar ambos
-        combined_df = pd.concat([merged_uni_df, merged_tecnica_df], ignore_index=True)
+def display():
+    st.title("Chat de Preguntas y Respuestas")
 
-        # Seleccionar columnas relevantes
-        combined_df = combined_df[['Carrera', 'Ingreso_promedio', 'Ingreso_Minimo', 'Ingreso_Maximo', 'Puestos_solicitados_2024']]
+    # Cargar la clave de RapidAPI desde los secretos de Streamlit (la URL se puede
+    # reemplazar por un servidor compatible, por ejemplo el stub local de benchmarks/)
+    rapidapi_key = st.secrets["RAPIDAPI"]["key"]
+    rapidapi_url = st.secrets["RAPIDAPI"].get("url", cliente_llm.URL)
 
-        # Crear un resumen para el contexto
-        contexto = "Datos de Carreras en Perú:\n\n"
+    # Inicializar el historial de chat en la sesión (acotado: los turnos antiguos se resumen)
+    if 'historial_chat' not in st.session_state:
+        st.session_state.historial_chat = HistorialChat()
+    historial = st.session_state.historial_chat
 
-        # Ingresos
-        contexto += "Ingresos Promedios por Carrera:\n"
-        for index, row in combined_df.iterrows():
-            contexto += f"- {row['Carrera']}: S/ {row['Ingreso_promedio']} (Mínimo: S/ {row['Ingreso_Minimo']}, Máximo: S/ {row['Ingreso_Maximo']})\n"
+    # Función para generar la respuesta basada en la entrada del usuario; la respuesta
+    # se muestra a medida que llega y se devuelve completa al terminar
+    def generar_respuesta_rapidapi(user_input, context, anteriores=(), clave=None):
+        mensajes = mensajes_modelo(user_input, context, anteriores)
 
-        # Puestos Solicitados
-        contexto += "\nPuestos Solicitados en 2024 por Carrera:\n"
-        for index, row in combined_df.iterrows():
-            contexto += f"- {row['Carrera']}: {row['Puestos_solicitados_2024']} puestos\n"
+        try:
+            st.markdown("**Asistente:**")
+            # Sesiones que hacen la misma pregunta a la vez comparten una sola llamada,
+            # y el coordinador limita las llamadas simultáneas de todo el proceso
+            fragmentos = obtener_coordinador().transmitir(
+                clave or user_input, lambda: cliente_llm.completar_stream(mensajes, rapidapi_key, rapidapi_url)
+            )
+            with metricas.tramo("llm"):
+                respuesta = st.write_stream(fragmentos)
+            return respuesta.strip() if isinstance(respuesta, str) else ""
+        except ServicioSaturado:
+            st.warning("Hay muchas consultas en curso. Intenta de nuevo en unos segundos.")
+            return ""
+        except requests.RequestException as e:
+            st.error(f"Error al comunicarse con la API de RapidAPI: {e}")
+            return ""
+        except Exception as e:
+            st.error(f"Error inesperado: {e}")
+            return ""
 
-        return contexto
+    # Los botones solo registran la pregunta (callbacks); se responde después de
+    # mostrar el historial para que la respuesta se transmita debajo de él
+    def preguntar(pregunta):
+        if pregunta:
+            st.session_state.pregunta_pendiente = pregunta
 
     # Cargar el contexto
-    contexto = cargar_contexto()
+    with metricas.tramo("contexto"):
+        contexto = cargar_contexto(version_combinado())
 
     # Interfaz de chat
     st.markdown("### Chat")
 
-    user_input = st.text_input("Haz una pregunta sobre los datos de carreras:", "")
-
-    if st.button("Enviar") and user_input:
-        # Añadir el mensaje del usuario al historial
-        st.session_state.chat_history.append({"role": "user", "content": user_input})
-
-        # Generar la respuesta utilizando la API de RapidAPI GPT-4
-        respuesta = generar_respuesta_rapidapi(user_input, contexto)
-
-        if respuesta:
-            # Añadir la respuesta al historial
-            st.session_state.chat_history.append({"role": "assistant", "content": respuesta})
+    st.text_input("Haz una pregunta sobre los datos de carreras:", "", key="pregunta_usuario")
+    st.button("Enviar", on_click=lambda: preguntar(st.session_state.pregunta_usuario))
 
-    # Mostrar el historial del chat
-    for chat in st.session_state.chat_history:
+    def mostrar_mensaje(chat):
         if chat["role"] == "user":
             st.markdown(f"**Tú:** {chat['content']}")
         else:
             st.markdown(f"**Asistente:** {chat['content']}")
 
+    # Mensajes anteriores a la ventana: por páginas y solo si se abre el expander
+    if historial.resumidos:
+        st.caption(f"{historial.resumidos} mensajes antiguos se conservan solo como resumen.")
+    paginas = historial.paginas()
+    if paginas:
+        anteriores = st.expander(f"Mensajes anteriores ({len(historial) - VENTANA})", key="historial_anterior",
+                                 on_change="rerun")
+        with anteriores:
+            if anteriores.open:
+                numero = st.number_input("Página (1 = la más reciente)", min_value=1, max_value=paginas, value=1,
+                                         key="pagina_historial")
+                for chat in historial.pagina(numero):
+                    mostrar_mensaje(chat)
+
+    # Mostrar solo los mensajes recientes del historial
+    for chat in historial.recientes():
+        mostrar_mensaje(chat)
+
+    pregunta = st.session_state.pop("pregunta_pendiente", None)
+    if pregunta:
+        # Turnos previos para el modelo, antes de añadir la pregunta actual. La respuesta
+        # depende de ellos: su huella entra en la clave del caché y de la llamada compartida.
+        # Las sugerencias van sin ellos, para acertar en el caché en cualquier turno
+        turnos_previos = [] if es_autonoma(pregunta) else historial.mensajes_para_modelo()
+        conversacion = huella_conversacion(turnos_previos)
+        # Añadir el mensaje del usuario al historial
+        historial.agregar("user", pregunta)
+        st.markdown(f"**Tú:** {pregunta}")
+
+        # Las consultas tabulares (máximos, rankings, valores de una carrera) se responden
+        # localmente; las repetidas, desde el caché (válido mientras no cambien los datos)
+        cache = obtener_cache_respuestas()
+        huella_contexto = huella_texto(contexto)
+        with metricas.tramo("consulta_local"):
+            respuesta = obtener_motor(version_combinado()).responder(pregunta)
+        origen = "local"
+        if not respuesta:
+            with metricas.tramo("cache_respuestas"):
+                respuesta = cache.obtener(pregunta, huella_contexto, conversacion)
+            origen = "cache"
+        if respuesta:
+            metricas.contar("chat", origen=origen)
+            st.markdown(f"**Asistente:** {respuesta}")
+        else:
+            # Generar la respuesta utilizando la API de RapidAPI GPT-4, con el contexto reducido
+            metricas.contar("chat", origen="llm")
+            with metricas.tramo("seleccion_contexto"):
+                contexto_pregunta = obtener_indice(version_combinado()).seleccionar(pregunta)
+            respuesta = generar_respuesta_rapidapi(
+                pregunta, contexto_pregunta, turnos_previos, clave=clave_llamada(pregunta, huella_contexto, conversacion)
+            )
+            if respuesta:
+                cache.guardar(pregunta, huella_contexto, respuesta, conversacion)
+
+        if respuesta:
+            # Añadir la respuesta al historial
+            historial.agregar("assistant", respuesta)
+
     # Sugerencias de preguntas
     st.markdown("### Sugerencias de Preguntas")
-    sugerencias = [
-        "¿Cuál es la carrera universitaria con mayor ingreso promedio?",
-        "¿Cuántos puestos se solicitaron para Ingeniería de Transportes en 2024?",
-        "¿Cuál es el ingreso máximo de Administración de Recursos Humanos?",
-        "¿Qué carrera técnica tiene el ingreso mínimo más alto?",
-        "¿Cuáles son las top 5 carreras con más puestos solicitados en 2024?"
-    ]
-
-    for sugerencia in sugerencias:
-        if st.button(sugerencia):
-            # Simular la entrada del usuario
-            st.session_state.chat_history.append({"role": "user", "content": sugerencia})
-            respuesta = generar_respuesta_rapidapi(sugerencia, contexto)
-            if respuesta:
-                st.session_state.chat_history.append({"role": "assistant", "content": respuesta})
+    for sugerencia in SUGERENCIAS:
+        # Simular la entrada del usuario
+        st.button(sugerencia, on_click=preguntar, args=(sugerencia,))
 
     # Pie de página con información adicional
     footnote = """
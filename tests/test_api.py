@@ -0,0 +1,51 @@
+# tests/test_api.py
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from api import ErrorConsulta, IndiceTabla
+
+
+@pytest.fixture(scope="module")
+def indice():
+    return IndiceTabla(pd.DataFrame({
+        'Carrera': ["Medicina Humana", "Derecho", "Contabilidad", "Ingeniería Civil"],
+        'Ingreso_promedio': pd.array([7200, 4800, 2300, 5600], dtype='Int64'),
+        'Ingreso_Minimo': pd.array([4100, 2300, 1300, 3100], dtype='Int64'),
+        'Ingreso_Maximo': pd.array([12500, 11000, 4600, 10400], dtype='Int64'),
+        'Puestos_solicitados_2024': pd.array([2350, 2710, 5200, None], dtype='Int64'),
+    }))
+
+
+def test_orden_corte_y_filtros(indice):
+    total, df = indice.consultar({"orden": "-Ingreso_promedio", "desde": "1", "limite": "2"})
+    assert total == 4
+    assert df['Carrera'].tolist() == ["Ingeniería Civil", "Derecho"]
+    total, df = indice.consultar({"ingreso_min": "4800.5", "puestos_max": "3000"})
+    assert df['Carrera'].tolist() == ["Medicina Humana"]
+
+
+@pytest.mark.parametrize("parametros", [
+    {"limite": "nan"},
+    {"limite": "1e400"},
+    {"limite": "2.5"},
+    {"limite": "-1"},
+    {"desde": "inf"},
+    {"desde": "abc"},
+    {"ingreso_min": "nan"},
+    {"ingreso_max": "1e400"},
+    {"puestos_min": "-inf"},
+])
+def test_parametros_numericos_invalidos(indice, parametros):
+    with pytest.raises(ErrorConsulta):
+        indice.consultar(parametros)
+
+
+def test_no_importa_streamlit():
+    # La API se sirve con uvicorn, fuera del runtime de Streamlit
+    codigo = "import sys, api; sys.exit('streamlit' in sys.modules)"
+    assert subprocess.run([sys.executable, "-c", codigo], cwd=Path(__file__).parent.parent).returncode == 0
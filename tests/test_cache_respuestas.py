@@ -0,0 +1,49 @@
+# tests/test_cache_respuestas.py
+
+import time
+
+from modules.cache_respuestas import CacheRespuestas, huella_conversacion
+
+
+def _cache(tmp_path, **opciones):
+    return CacheRespuestas(ruta=str(tmp_path / "respuestas.sqlite3"), **opciones)
+
+
+def test_acierta_en_memoria_y_en_disco(tmp_path):
+    cache = _cache(tmp_path)
+    cache.guardar("¿Qué carrera paga más?", "h1", "Medicina")
+    assert cache.obtener("que carrera paga mas", "h1") == "Medicina"
+    assert cache.contadores["aciertos_memoria"] == 1
+
+    # Otro proceso: memoria vacía, la respuesta sale de SQLite
+    otro = _cache(tmp_path)
+    assert otro.obtener("¿Qué carrera paga más?", "h1") == "Medicina"
+    assert otro.contadores["aciertos_disco"] == 1
+
+
+def test_la_memoria_respeta_el_ttl(tmp_path, monkeypatch):
+    cache = _cache(tmp_path, ttl=60)
+    cache.guardar("pregunta", "h1", "respuesta")
+    ahora = time.time()
+    monkeypatch.setattr(time, "time", lambda: ahora + 61)
+    assert cache.obtener("pregunta", "h1") is None
+    assert cache.contadores["aciertos_memoria"] == 0
+    assert cache._memoria == {}
+
+
+def test_una_huella_nueva_descarta_las_respuestas(tmp_path):
+    cache = _cache(tmp_path)
+    cache.guardar("pregunta", "h1", "respuesta")
+    assert cache.obtener("pregunta", "h2") is None
+    assert _cache(tmp_path).obtener("pregunta", "h1") is None
+
+
+def test_la_conversacion_forma_parte_de_la_clave(tmp_path):
+    cache = _cache(tmp_path)
+    turnos = [{"role": "user", "content": "¿Cuánto gana Derecho?"}, {"role": "assistant", "content": "S/ 4 800"}]
+    cache.guardar("¿y la técnica?", "h1", "Contabilidad", huella_conversacion(turnos))
+    assert cache.obtener("¿y la técnica?", "h1") is None
+    assert cache.obtener("¿y la técnica?", "h1", huella_conversacion(turnos[:1])) is None
+    assert cache.obtener("¿y la técnica?", "h1", huella_conversacion(turnos)) == "Contabilidad"
+    # Sin turnos previos la clave es la de siempre
+    assert huella_conversacion([]) == ""
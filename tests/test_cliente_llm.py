@@ -0,0 +1,27 @@
+# tests/test_cliente_llm.py
+
+import pytest
+
+from benchmarks.servidor_llm_falso import iniciar
+from modules import cliente_llm
+
+PREGUNTA = "¿Cuánto gana Ingeniería Agroindustrial? Más de S/ 3 000, ¿señor?"
+
+
+@pytest.fixture
+def servidor():
+    servidor = iniciar()
+    yield f"http://127.0.0.1:{servidor.server_port}/v1/chat/completions"
+    servidor.shutdown()
+
+
+def test_transmite_texto_con_tildes(servidor):
+    fragmentos = list(cliente_llm.completar_stream([{"role": "user", "content": PREGUNTA}], "clave", servidor))
+    assert len(fragmentos) > 1
+    assert "".join(fragmentos).strip() == f"Respuesta de prueba a: {PREGUNTA}"
+
+
+def test_respuesta_completa_con_tildes(servidor):
+    assert cliente_llm.completar([{"role": "user", "content": PREGUNTA}], "clave", servidor) == (
+        f"Respuesta de prueba a: {PREGUNTA}"
+    )
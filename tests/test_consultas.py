@@ -0,0 +1,106 @@
+# tests/test_consultas.py
+#
+# Respuestas locales del chat sobre una muestra con los nombres de los cuadros del MTPE,
+# incluidos los grupos con notas al pie ("Otras Ingenierías (2)").
+
+import pandas as pd
+import pytest
+
+from modules.consultas import MotorConsultas
+from paginas.preguntas import SUGERENCIAS
+
+FILAS = [
+    # Tipo, Carrera, promedio, mínimo, máximo, puestos
+    ("universitaria", "Medicina Humana", 7200, 4100, 12500, 2350),
+    ("universitaria", "Administración", 3900, 2000, 9000, 8120),
+    ("universitaria", "Ingeniería Civil", 5600, 3100, 10400, 3980),
+    ("universitaria", "Derecho", 4800, 2300, 11000, 2710),
+    ("universitaria", "Otras Carreras de Administración (1)", 3600, 1900, 7800, 640),
+    ("universitaria", "Otras Ingenierías (2)", 5100, 2800, 9600, 410),
+    ("tecnica", "Computación e Informática", 2600, 1400, 5200, 4100),
+    ("tecnica", "Enfermería Técnica", 2100, 1250, 3900, 3600),
+    ("tecnica", "Contabilidad", 2300, 1300, 4600, 5200),
+    ("tecnica", "Mecánica Automotriz", 2700, 1500, 5800, 1900),
+    ("tecnica", "Otras Carreras de Administración (3)", 2200, 1200, 4300, 980),
+]
+
+
+@pytest.fixture(scope="module")
+def motor():
+    df = pd.DataFrame(FILAS, columns=[
+        'Tipo', 'Carrera', 'Ingreso_promedio', 'Ingreso_Minimo', 'Ingreso_Maximo', 'Puestos_solicitados_2024',
+    ])
+    for columna in df.columns[2:]:
+        df[columna] = df[columna].astype('Int64')
+    return MotorConsultas(df)
+
+
+def test_sugerencias(motor):
+    respuestas = [motor.responder(sugerencia) for sugerencia in SUGERENCIAS]
+    assert respuestas[0] == "La carrera universitaria con mayor ingreso promedio es Medicina Humana (S/ 7 200)."
+    # Ingeniería de Transportes no tiene fila propia: el MTPE la cuenta en Otras Ingenierías
+    assert respuestas[1] == (
+        "El MTPE incluye Ingeniería de Transportes en el grupo «Otras Ingenierías».\n"
+        "En 2024 se solicitaron 410 puestos para Otras Ingenierías (2)."
+    )
+    # Es una carrera técnica del grupo técnico, no la fila universitaria de Administración
+    assert respuestas[2] == (
+        "El MTPE incluye Administración de Recursos Humanos en el grupo «Otras Carreras de Administración».\n"
+        "El ingreso máximo de Otras Carreras de Administración (3) es S/ 4 300."
+    )
+    assert respuestas[3] == "La carrera técnica con mayor ingreso mínimo es Mecánica Automotriz (S/ 1 500)."
+    assert respuestas[4].splitlines() == [
+        "Las 5 carreras con más puestos solicitados en 2024:",
+        "1. Administración: 8 120",
+        "2. Contabilidad: 5 200",
+        "3. Computación e Informática: 4 100",
+        "4. Ingeniería Civil: 3 980",
+        "5. Enfermería Técnica: 3 600",
+    ]
+
+
+@pytest.mark.parametrize("pregunta", [
+    "¿Qué carrera tiene más demanda que Medicina Humana?",
+    "¿Qué carrera tiene más demanda que Medicina?",
+    "¿Derecho gana más que Administración?",
+    # Umbrales: piden todas las carreras que lo cumplen, no la primera del ranking
+    "¿Qué carreras ganan más de 5000 soles?",
+    "¿Qué carreras tienen más de 3000 puestos?",
+    "¿Qué carreras técnicas pagan entre S/ 2 000 y S/ 3 000?",
+    # Conteos
+    "¿Cuántas carreras técnicas tienen ingreso mayor a 2500?",
+    "¿Cuántas carreras universitarias hay?",
+    # Varias métricas a la vez
+    "¿Cuál es la diferencia entre el ingreso máximo y mínimo de Derecho?",
+    "¿Cuál es el ingreso mínimo y máximo de Derecho?",
+    "¿Qué carrera paga más y tiene más puestos?",
+])
+def test_preguntas_que_van_al_modelo(motor, pregunta):
+    assert motor.responder(pregunta) is None
+
+
+@pytest.mark.parametrize("pregunta", [
+    # Administración es solo el comienzo del nombre
+    "¿Cuál es el ingreso máximo de Administración de Negocios Internacionales?",
+    "¿Cuánto gana Ingeniería Civil Ambiental?",
+    # Alias cuyo grupo no está en la muestra
+    "¿Cuántos puestos hubo para Educación Básica Alternativa?",
+])
+def test_no_responde_con_otra_carrera(motor, pregunta):
+    assert motor.responder(pregunta) is None
+
+
+def test_valor_de_una_carrera(motor):
+    assert motor.responder("¿Cuánto gana Medicina Humana en 2024?") == (
+        "El ingreso promedio de Medicina Humana es S/ 7 200."
+    )
+    assert motor.responder("ingreso minimo de administracion") == "El ingreso mínimo de Administración es S/ 2 000."
+    # Con errores de tipeo
+    assert motor.responder("¿Cuánto gana Ingenieria Civl?") == "El ingreso promedio de Ingeniería Civil es S/ 5 600."
+
+
+def test_buscar_carreras(motor):
+    assert motor.buscar_carreras("cuanto gana derecho") == [3]
+    assert motor.buscar_carreras("cual es la carrera mejor pagada") == []
+    assert motor.buscar_carreras("derecho o medicina humana") is None
+    assert motor.buscar_carreras("gestion y alta direccion") == [4]
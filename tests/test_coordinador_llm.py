@@ -0,0 +1,97 @@
+# tests/test_coordinador_llm.py
+#
+# El coordinador contra el endpoint falso de benchmarks/: las llamadas se mantienen
+# abiertas con un Event para que las sesiones se sumen mientras siguen en curso.
+
+import threading
+import time
+
+import pytest
+import requests
+
+from benchmarks.servidor_llm_falso import iniciar
+from modules import cliente_llm
+from modules.coordinador_llm import CoordinadorLLM, ServicioSaturado
+
+PREGUNTA = [{"role": "user", "content": "¿Qué carrera técnica paga más?"}]
+
+
+@pytest.fixture
+def servidor():
+    servidor = iniciar()
+    servidor.url = f"http://127.0.0.1:{servidor.server_port}/v1/chat/completions"
+    yield servidor
+    servidor.shutdown()
+
+
+def _retenida(puerta, fabrica):
+    # La llamada no empieza a llegar hasta que se abre la puerta
+    def generar():
+        assert puerta.wait(10)
+        yield from fabrica()
+    return generar
+
+
+def _esperar_libre(coordinador):
+    # El hilo del pool libera su lugar justo después de entregar el último fragmento
+    limite = time.monotonic() + 5
+    while coordinador.estadisticas()["en_curso"] and time.monotonic() < limite:
+        time.sleep(0.01)
+
+
+def test_claves_iguales_comparten_una_llamada(servidor):
+    coordinador = CoordinadorLLM(max_concurrentes=2, max_en_cola=0)
+    puerta = threading.Event()
+    fabrica = _retenida(puerta, lambda: cliente_llm.completar_stream(PREGUNTA, "clave", servidor.url))
+    lectores = [coordinador.transmitir(("pregunta", "h1"), fabrica) for _ in range(5)]
+    puerta.set()
+    respuestas = {"".join(lector) for lector in lectores}
+
+    assert respuestas == {"Respuesta de prueba a: ¿Qué carrera técnica paga más? "}
+    assert servidor.RequestHandlerClass.peticiones == 1
+    assert coordinador.contadores == {"llamadas": 1, "compartidas": 4, "rechazadas": 0}
+    # Terminada la llamada, la misma clave vuelve a consultar el modelo
+    _esperar_libre(coordinador)
+    assert "".join(coordinador.transmitir(("pregunta", "h1"), fabrica))
+    assert servidor.RequestHandlerClass.peticiones == 2
+
+
+def test_rechaza_mas_alla_de_concurrentes_y_cola():
+    coordinador = CoordinadorLLM(max_concurrentes=1, max_en_cola=2)
+    puerta = threading.Event()
+    fabrica = _retenida(puerta, lambda: iter(["ok"]))
+    lectores = [coordinador.transmitir(f"clave {i}", fabrica) for i in range(3)]
+    with pytest.raises(ServicioSaturado):
+        coordinador.transmitir("clave 3", fabrica)
+    # Sumarse a una llamada en curso no ocupa lugar
+    lectores.append(coordinador.transmitir("clave 0", fabrica))
+    assert coordinador.estadisticas() == {"llamadas": 3, "compartidas": 1, "rechazadas": 1, "en_curso": 3}
+
+    puerta.set()
+    assert ["".join(lector) for lector in lectores] == ["ok"] * 4
+    _esperar_libre(coordinador)
+    assert "".join(coordinador.transmitir("clave 3", fabrica)) == "ok"
+
+
+def test_el_error_llega_a_todos_los_lectores(servidor):
+    # 400 no se reintenta: la llamada falla una sola vez
+    servidor.RequestHandlerClass.fallos = 1
+    servidor.RequestHandlerClass.estado_fallo = 400
+    coordinador = CoordinadorLLM()
+    puerta = threading.Event()
+    fabrica = _retenida(puerta, lambda: cliente_llm.completar_stream(PREGUNTA, "clave", servidor.url))
+    lectores = [coordinador.transmitir("pregunta", fabrica) for _ in range(3)]
+    puerta.set()
+    for lector in lectores:
+        with pytest.raises(requests.HTTPError):
+            "".join(lector)
+    assert servidor.RequestHandlerClass.peticiones == 1
+
+
+def test_espera_agotada():
+    coordinador = CoordinadorLLM(espera=0.05)
+    puerta = threading.Event()
+    lector = coordinador.transmitir("lenta", _retenida(puerta, lambda: iter(["tarde"])))
+    with pytest.raises(ServicioSaturado):
+        next(lector)
+    puerta.set()
@@ -0,0 +1,72 @@
+# tests/test_dimension_carreras.py
+#
+# Un par ingresos/demanda con los nombres escritos como en los cuadros del MTPE:
+# notas al pie, mayúsculas sin tildes, espacios de más y una carrera repetida.
+
+import pandas as pd
+import pytest
+
+from modules.dimension_carreras import claves, cobertura, construir_dimension, unir
+
+
+@pytest.fixture
+def ingresos():
+    return pd.DataFrame({
+        'Carrera': ["Educación (3)", "  Derecho ", "Ingeniería  Civil", "Medicina Humana", "Derecho", "Arquitectura"],
+        'Ingreso_promedio': pd.array([2900, 4800, 5600, 7200, 9999, 4500], dtype='Int64'),
+    })
+
+
+@pytest.fixture
+def demanda():
+    return pd.DataFrame({
+        'Carrera': ["EDUCACION", "Derecho", "ingenieria civil", "MEDICINA HUMANA (1)", "Obstetricia"],
+        'Puestos_solicitados_2024': pd.array([1200, 2710, 3980, 2350, 800], dtype='Int64'),
+    })
+
+
+def test_claves(ingresos, demanda):
+    assert claves(ingresos['Carrera']).tolist() == [
+        "educacion", "derecho", "ingenieria civil", "medicina humana", "derecho", "arquitectura",
+    ]
+    assert claves(pd.Series(["EDUCACION", None])).tolist() == ["educacion", ""]
+
+
+def test_dimension_una_fila_por_clave(ingresos, demanda):
+    dimension = construir_dimension([("universitaria", ingresos), ("universitaria", demanda)])
+    assert dimension['Clave'].tolist() == [
+        "educacion", "derecho", "ingenieria civil", "medicina humana", "arquitectura", "obstetricia",
+    ]
+    assert dimension['Id_carrera'].tolist() == list(range(6))
+    # Se conserva el primer nombre visto
+    assert dimension['Carrera'].iloc[0] == "Educación (3)"
+
+
+def test_unir_por_clave(ingresos, demanda):
+    dimension = construir_dimension([("universitaria", ingresos), ("universitaria", demanda)])
+    unidas = unir(ingresos, demanda, dimension, "universitaria")
+    assert unidas.set_index('Carrera')['Puestos_solicitados_2024'].to_dict() == {
+        "Educación (3)": 1200,
+        "  Derecho ": 2710,
+        "Ingeniería  Civil": 3980,
+        "Medicina Humana": 2350,
+    }
+    # De la clave repetida queda la primera fila
+    assert unidas.loc[unidas['Carrera'] == "  Derecho ", 'Ingreso_promedio'].item() == 4800
+    # Otro tipo no comparte los ids
+    assert unir(ingresos, demanda, dimension, "tecnica").empty
+
+
+def test_cobertura(ingresos, demanda):
+    dimension = construir_dimension([("universitaria", ingresos), ("universitaria", demanda)])
+    unidas = unir(ingresos, demanda, dimension, "universitaria")
+    assert cobertura(ingresos, demanda, unidas, Tipo="universitaria") == {
+        'Tipo': "universitaria",
+        'Ingresos': 5,
+        'Demanda': 5,
+        'Unidas': 4,
+        # Solo "Derecho" coincide letra por letra
+        'Unidas_texto_exacto': 1,
+        'Solo_ingresos': 1,
+        'Solo_demanda': 1,
+    }
@@ -0,0 +1,86 @@
+# tests/test_fuentes.py
+#
+# Publicación de las tablas con libros regionales: una región que falla o que está
+# mal declarada se omite sin afectar a las demás ni a las tablas nacionales.
+
+import json
+
+import pandas as pd
+import pytest
+import requests
+
+from modules import fuentes
+
+CARRERAS = ["Medicina Humana", "Derecho", "Contabilidad"]
+
+
+def _fuente(nombre, url=None):
+    # Sustituye a cargar_fuente: tablas ya limpias, con montos distintos por región
+    base = 1000 if url is None else 100 * len(url)
+    if fuentes.FUENTES[nombre]["tabla"] == "ingresos":
+        return pd.DataFrame({
+            'Carrera': CARRERAS,
+            'Ingreso_promedio': pd.array([base + 3, base + 2, base + 1], dtype='Int64'),
+            'Ingreso_Minimo': pd.array([base, base, base], dtype='Int64'),
+            'Ingreso_Maximo': pd.array([base * 2] * 3, dtype='Int64'),
+        })
+    return pd.DataFrame({'Carrera': CARRERAS, 'Puestos_solicitados_2024': pd.array([30, 20, 10], dtype='Int64')})
+
+
+def _urls(region):
+    return {nombre: f"https://mtpe.example/{region}/{nombre}.xlsx" for nombre in fuentes.FUENTES}
+
+
+@pytest.fixture
+def libros(monkeypatch):
+    monkeypatch.setattr(fuentes, "cargar_fuente", _fuente)
+
+
+def test_regiones_omite_las_incompletas(tmp_path, monkeypatch):
+    incompleta = _urls("Cusco")
+    del incompleta["demanda_tecnica"]
+    archivo = tmp_path / "regiones.json"
+    archivo.write_text(json.dumps({"Nacional": _urls("Nacional"), "Arequipa": _urls("Arequipa"), "Cusco": incompleta}))
+    monkeypatch.setattr(fuentes, "ARCHIVO_REGIONES", str(archivo))
+    assert fuentes.regiones() == {"Arequipa": _urls("Arequipa")}
+
+
+def test_una_region_que_falla_no_impide_publicar(libros, monkeypatch):
+    monkeypatch.setattr(fuentes, "regiones", lambda: {})
+    sin_regiones = fuentes.refrescar_tablas()
+
+    def falla_en_cusco(nombre, url=None):
+        if url and "/Cusco/" in url and nombre == "ingresos_tecnica":
+            raise requests.HTTPError("404 Client Error")
+        return _fuente(nombre, url)
+
+    monkeypatch.setattr(fuentes, "cargar_fuente", falla_en_cusco)
+    monkeypatch.setattr(fuentes, "regiones", lambda: {"Arequipa": _urls("Arequipa"), "Cusco": _urls("Cusco")})
+    tablas = fuentes.refrescar_tablas()
+
+    for tipo in fuentes.TIPOS:
+        assert list(tablas[f"regional_{tipo}"]['Region'].unique()) == ["Nacional", "Arequipa"]
+        pd.testing.assert_frame_equal(tablas[tipo], sin_regiones[tipo])
+    assert set(tablas["cobertura"]['Region']) == {"Nacional", "Arequipa"}
+
+
+def test_sin_regiones_cargadas_no_hay_tablas_regionales(libros, monkeypatch):
+    def falla(nombre, url=None):
+        if url:
+            raise requests.ConnectionError("sin conexión")
+        return _fuente(nombre, url)
+
+    monkeypatch.setattr(fuentes, "cargar_fuente", falla)
+    monkeypatch.setattr(fuentes, "regiones", lambda: {"Piura": _urls("Piura")})
+    tablas = fuentes.refrescar_tablas()
+    assert not any(nombre.startswith("regional_") for nombre in tablas)
+    assert len(tablas["combinado"]) == 2 * len(CARRERAS)
+
+
+def test_una_fuente_nacional_que_falla_se_propaga(monkeypatch):
+    def falla(nombre, url=None):
+        raise requests.HTTPError("503 Server Error")
+
+    monkeypatch.setattr(fuentes, "cargar_fuente", falla)
+    with pytest.raises(requests.HTTPError):
+        fuentes.cargar_fuentes({})
@@ -0,0 +1,31 @@
+# tests/test_graficos.py
+
+import pandas as pd
+import pytest
+
+from modules.graficos import FIGURAS, construir_figura, vistas_derivadas
+from modules.tendencia import MODOS
+
+
+@pytest.fixture
+def carreras():
+    # Celdas vacías o "-" en los libros quedan como <NA> al limpiar
+    return pd.DataFrame({
+        'Carrera': ["Medicina Humana", "Derecho", "Contabilidad", "Ingeniería Civil", "Enfermería Técnica"],
+        'Ingreso_promedio': pd.array([7200, 4800, None, 5600, 2100], dtype='Int64'),
+        'Ingreso_Minimo': pd.array([4100, None, 1300, 3100, 1250], dtype='Int64'),
+        'Ingreso_Maximo': pd.array([12500, None, 4600, 10400, 3900], dtype='Int64'),
+        'Puestos_solicitados_2024': pd.array([2350, 2710, 5200, None, 3600], dtype='Int64'),
+    })
+
+
+@pytest.mark.parametrize("nombre", FIGURAS)
+@pytest.mark.parametrize("modo", MODOS)
+def test_figuras_con_valores_faltantes(carreras, nombre, modo):
+    figura = construir_figura(nombre, vistas_derivadas(carreras), modo)
+    assert figura.to_json()
+
+
+def test_relacion_solo_con_ambos_datos(carreras):
+    figura = construir_figura("relacion", vistas_derivadas(carreras))
+    assert sorted(figura.data[0].hovertext) == ["Derecho", "Enfermería Técnica", "Medicina Humana"]
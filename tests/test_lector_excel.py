@@ -0,0 +1,75 @@
+# tests/test_lector_excel.py
+
+import io
+
+import pytest
+from openpyxl import Workbook
+
+from modules import lector_excel
+
+MOTORES = [m for m in lector_excel.MOTORES if m != "calamine" or lector_excel.CalamineWorkbook is not None]
+
+
+def _libro(filas, notas=("(1) Nota al pie del cuadro.", "Fuente: MTPE - Planilla Electrónica."), total=None):
+    # Mismo diseño que los libros del MTPE: títulos, encabezado en la fila 5 y datos desde la columna C
+    wb = Workbook()
+    ws = wb.active
+    ws["B1"] = "PERÚ: REMUNERACIÓN PROMEDIO MENSUAL"
+    for columna, texto in enumerate(["Familia de carreras (1)", "Remuneración promedio", "Mínimo - Máximo (2)"], start=3):
+        ws.cell(5, columna, texto)
+    for i, fila in enumerate(filas):
+        for j, valor in enumerate(fila):
+            ws.cell(6 + i, 3 + j, valor)
+    if total is not None:
+        # Fila de total pegada a la tabla, sin fila vacía antes
+        ws.cell(6 + len(filas), 3, "Total")
+        ws.cell(6 + len(filas), 4, total)
+    for j, nota in enumerate(notas):
+        ws.cell(6 + len(filas) + 2 + j, 3, nota)
+    contenido = io.BytesIO()
+    wb.save(contenido)
+    contenido.seek(0)
+    return contenido
+
+
+def _leer(contenido, motor):
+    return lector_excel.leer_tabla(contenido, "C:E", ["Carrera", "Ingreso_promedio", "Minimo_Maximo"], motor=motor)
+
+
+@pytest.mark.parametrize("motor", MOTORES)
+def test_celdas_vacias_o_guion_no_cortan_la_tabla(motor):
+    filas = [
+        ("A", "S/ 2 500", "S/ 1 200 - S/ 3 400"),
+        ("B", "S/ 3 000", "-"),
+        ("C", "S/ 4 000", None),
+        ("D", "-", "S/ 900 - S/ 1 500"),
+        ("E", "S/ 5 000", "S/ 2 500 - S/ 9 000"),
+    ]
+    df = _leer(_libro(filas), motor)
+    assert df["Carrera"].tolist() == ["A", "B", "C", "D", "E"]
+
+
+@pytest.mark.parametrize("motor", MOTORES)
+def test_termina_en_notas_fila_vacia_o_total(motor):
+    filas = [("A", "S/ 2 500", "S/ 1 200 - S/ 3 400"), ("Total", "S/ 2 600", "S/ 1 000 - S/ 4 000")]
+    assert _leer(_libro(filas), motor)["Carrera"].tolist() == ["A"]
+    # Las notas escritas en la columna de carreras, justo debajo de la tabla
+    filas = [("A", "S/ 2 500", "S/ 1 200 - S/ 3 400"), ("B", "S/ 3 000", "S/ 1 500 - S/ 6 000")]
+    assert _leer(_libro(filas), motor)["Carrera"].tolist() == ["A", "B"]
+
+
+@pytest.mark.parametrize("motor", MOTORES)
+def test_empieza_en_la_primera_fila_con_monto(motor):
+    filas = [("Carrera sin dato", None, None), ("A", "S/ 2 500", "S/ 1 200 - S/ 3 400")]
+    assert _leer(_libro(filas), motor)["Carrera"].tolist() == ["A"]
+
+
+@pytest.mark.parametrize("motor", MOTORES)
+def test_demanda_con_la_unica_columna_de_valores_vacia(motor):
+    # C:D: si la única celda de valores está vacía o tiene "-", la fila se conserva
+    filas = [("A", 1200), ("B", None), ("C", "-"), ("D", 350)]
+    for total in (None, 1550):
+        df = lector_excel.leer_tabla(_libro(filas, total=total), "C:D", ["Carrera", "Puestos_solicitados_2024"],
+                                     motor=motor)
+        assert df["Carrera"].tolist() == ["A", "B", "C", "D"]
+        assert df["Puestos_solicitados_2024"].tolist()[0] == 1200
@@ -0,0 +1,71 @@
+# tests/test_limpieza.py
+#
+# Compara la limpieza vectorizada con el comportamiento anterior (extract_min_max
+# fila por fila y astype(int)) sobre valores con el formato de los libros del MTPE.
+
+import re
+
+import pandas as pd
+import pytest
+
+from modules.limpieza import extraer_rango, limpiar_moneda
+
+RANGOS = pd.Series([
+    "S/ 1 200 - S/ 3 400",
+    "S/ 950 - S/ 1 800",
+    "S/ 12 300 - S/ 25 000",
+    "S/1 100 - S/2 000",
+    "S/ 2 500 - S/ 10 200",
+])
+
+MONEDAS = pd.Series(["S/ 2 500", "S/ 12 000", "S/ 950", "S/1 234", "4407"])
+
+
+def extract_min_max(s):
+    # Versión anterior, fila por fila
+    numbers = re.findall(r'\d{1,3}(?:\s\d{3})*', s)
+    if len(numbers) >= 2:
+        return pd.Series([int(numbers[0].replace(' ', '')), int(numbers[1].replace(' ', ''))])
+    return pd.Series([None, None])
+
+
+def test_rango_igual_al_anterior():
+    anterior = RANGOS.apply(extract_min_max)
+    nuevo = extraer_rango(RANGOS)
+    assert nuevo['Ingreso_Minimo'].tolist() == anterior[0].tolist()
+    assert nuevo['Ingreso_Maximo'].tolist() == anterior[1].tolist()
+    assert str(nuevo['Ingreso_Minimo'].dtype) == 'Int64'
+
+
+def test_rango_con_un_numero_o_vacio_queda_sin_dato():
+    serie = pd.Series(["S/ 1 200", "", None, "-"])
+    anterior = serie.fillna("").apply(extract_min_max)
+    nuevo = extraer_rango(serie)
+    assert anterior[0].isna().all()
+    assert nuevo['Ingreso_Minimo'].isna().all()
+    assert nuevo['Ingreso_Maximo'].isna().all()
+
+
+def test_rango_conserva_el_indice():
+    serie = pd.Series(["S/ 1 200 - S/ 3 400", "-", "S/ 900 - S/ 1 500"], index=[10, 11, 12])
+    nuevo = extraer_rango(serie)
+    assert nuevo.index.tolist() == [10, 11, 12]
+    assert nuevo.loc[12, 'Ingreso_Maximo'] == 1500
+    assert pd.isna(nuevo.loc[11, 'Ingreso_Minimo'])
+
+
+def test_moneda_igual_al_anterior():
+    anterior = MONEDAS.astype(str).str.replace(r'[^\d]', '', regex=True).astype(int)
+    assert limpiar_moneda(MONEDAS).tolist() == anterior.tolist()
+
+
+def test_moneda_numerica_se_conserva():
+    assert limpiar_moneda(pd.Series([4407, 12000.0])).tolist() == [4407, 12000]
+
+
+@pytest.mark.parametrize("vacio", ["", None, "-"])
+def test_moneda_vacia_queda_sin_dato(vacio):
+    # La versión anterior fallaba con astype(int); ahora queda <NA>
+    resultado = limpiar_moneda(pd.Series(["S/ 2 500", vacio]))
+    assert resultado.iloc[0] == 2500
+    assert pd.isna(resultado.iloc[1])
@@ -0,0 +1,17 @@
+# tests/test_preguntas.py
+
+from modules.cache_respuestas import huella_conversacion
+from paginas.preguntas import SUGERENCIAS, clave_llamada, es_autonoma
+
+
+def test_las_sugerencias_no_dependen_de_la_conversacion():
+    assert all(es_autonoma(sugerencia) for sugerencia in SUGERENCIAS)
+    # Escrita a mano, sin tildes ni signos, sigue siendo la misma sugerencia
+    assert es_autonoma("cual es el ingreso maximo de administracion de recursos humanos")
+    assert not es_autonoma("¿Y la técnica?")
+
+
+def test_clave_sin_conversacion_igual_a_la_del_precalentamiento():
+    turnos = [{"role": "user", "content": "¿Cuánto gana Derecho?"}]
+    assert clave_llamada(SUGERENCIAS[1], "h1") == clave_llamada(SUGERENCIAS[1], "h1", huella_conversacion([]))
+    assert clave_llamada("¿Y la técnica?", "h1", huella_conversacion(turnos)) != clave_llamada("¿Y la técnica?", "h1")
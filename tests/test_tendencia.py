@@ -0,0 +1,82 @@
+# tests/test_tendencia.py
+#
+# La línea de tendencia calculada con NumPy frente a np.polyfit y valores conocidos
+# (antes la calculaba statsmodels a través de plotly).
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import pytest
+
+from modules.tendencia import agregar_tendencia, ajustar_tendencia
+
+RNG = np.random.default_rng(7)
+X = RNG.uniform(1500, 9000, 60)
+Y = 0.4 * X + 300 + RNG.normal(0, 400, 60)
+
+
+def _r2(x, y, pendiente, intercepto):
+    residuos = y - (pendiente * x + intercepto)
+    return 1 - np.sum(residuos ** 2) / np.sum((y - y.mean()) ** 2)
+
+
+def test_ols_igual_a_polyfit():
+    ajuste = ajustar_tendencia(X, Y, "ols")
+    pendiente, intercepto = np.polyfit(X, Y, 1)
+    assert ajuste["pendiente"] == pytest.approx(pendiente)
+    assert ajuste["intercepto"] == pytest.approx(intercepto)
+    assert ajuste["r2"] == pytest.approx(_r2(X, Y, pendiente, intercepto))
+    assert ajuste["r2"] == pytest.approx(np.corrcoef(X, Y)[0, 1] ** 2)
+    assert (ajuste["n"], ajuste["x_min"], ajuste["x_max"]) == (60, X.min(), X.max())
+
+
+def test_log_ajusta_una_potencia():
+    # y = 5·x^-0.5 es una recta en log-log: pendiente -0.5, intercepto log10(5), R² = 1
+    x = np.array([1.0, 10.0, 100.0, 1000.0])
+    ajuste = ajustar_tendencia(x, 5 * x ** -0.5, "log")
+    assert ajuste["pendiente"] == pytest.approx(-0.5)
+    assert ajuste["intercepto"] == pytest.approx(np.log10(5))
+    assert ajuste["r2"] == pytest.approx(1.0)
+    assert (ajuste["x_min"], ajuste["x_max"]) == (0.0, 3.0)
+    # Los valores no positivos no tienen logaritmo y se descartan
+    assert ajustar_tendencia([0, -1, *x], [1, 1, *(5 * x ** -0.5)], "log")["n"] == 4
+
+
+def test_robusta_resiste_valores_atipicos():
+    x = np.arange(10, dtype=float)
+    y = 2 * x + 1
+    y[[3, 8]] = [60, -40]
+    ajuste = ajustar_tendencia(x, y, "robusta")
+    assert ajuste["pendiente"] == pytest.approx(2.0)
+    assert ajuste["intercepto"] == pytest.approx(1.0)
+    # Mínimos cuadrados se desvía con los mismos puntos
+    assert ajustar_tendencia(x, y, "ols")["pendiente"] != pytest.approx(2.0, abs=0.5)
+
+
+@pytest.mark.parametrize("modo", ["ols", "log", "robusta"])
+def test_sin_puntos_suficientes(modo):
+    assert ajustar_tendencia([], [], modo) is None
+    assert ajustar_tendencia([3.0], [4.0], modo) is None
+    # Todos los x iguales (ptp == 0): la pendiente no está definida
+    assert ajustar_tendencia([5.0, 5.0, 5.0], [1.0, 2.0, 3.0], modo) is None
+
+
+@pytest.mark.parametrize("modo", ["ols", "log", "robusta"])
+def test_valores_faltantes(modo):
+    x = pd.Series([1000, 2000, None, 4000, 5000], dtype='Int64')
+    y = pd.Series([10, 20, 30, None, 50], dtype='Int64')
+    ajuste = ajustar_tendencia(x, y, modo)
+    assert ajuste["n"] == 3
+    esperado = ajustar_tendencia([1000, 2000, 5000], [10, 20, 50], modo)
+    assert ajuste == esperado
+
+
+def test_modo_desconocido():
+    with pytest.raises(ValueError):
+        ajustar_tendencia(X, Y, "cuadratica")
+
+
+def test_agregar_tendencia():
+    figura = agregar_tendencia(go.Figure(), ajustar_tendencia(X, Y, "ols"), puntos=5)
+    assert len(figura.data) == 1 and len(figura.data[0].x) == 5
+    assert agregar_tendencia(go.Figure(), None).data == ()